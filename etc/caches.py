@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class BoundedCache:
+    """Thread-safe in-process mapping holding at most `size` entries.
+    Least recently used entries are evicted first.
+    Optionally entries may expire after a certain time.
+
+    Cache hits and misses are counted in `hits` and `misses` attributes
+    and could be used to tune cache size.
+
+    .. code-block:: python
+
+        cache = BoundedCache(size=256)
+
+        value = cache.get('key')
+
+        if value is None:
+            value = compute()
+            cache.set('key', value)
+
+    """
+    __slots__ = ['size', 'ttl', 'hits', 'misses', '_data', '_lock']
+
+    def __init__(self, size: int = 128, ttl: Optional[float] = None):
+        """
+        :param size: Max number of entries to keep. Zero disables caching.
+        :param ttl: Number of seconds an entry stays valid. None - entries do not expire.
+
+        """
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a value for the given key or default.
+
+        :param key:
+        :param default:
+
+        """
+        with self._lock:
+            data = self._data
+
+            if key not in data:
+                self.misses += 1
+                return default
+
+            value, expires = data[key]
+
+            if expires is not None and expires <= monotonic():
+                del data[key]
+                self.misses += 1
+                return default
+
+            data.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Puts the value into cache, evicting the oldest entries if needed.
+
+        :param key:
+        :param value:
+
+        """
+        size = self.size
+
+        if size <= 0:
+            return
+
+        ttl = self.ttl
+        expires = None if ttl is None else monotonic() + ttl
+
+        with self._lock:
+            data = self._data
+            data[key] = (value, expires)
+            data.move_to_end(key)
+
+            while len(data) > size:
+                data.popitem(last=False)
+
+    def clear(self):
+        """Drops all the entries."""
+        with self._lock:
+            self._data.clear()
@@ -1,4 +1,24 @@
-from typing import Union, Set, List, Tuple, Dict, Type, Any
+from types import MappingProxyType
+from typing import Union, Set, List, Tuple, Dict, Type, Any, Iterable, Mapping
+
+from django.core.signals import setting_changed
+from django.db.models import Case, CharField, Value, When
+from django.utils.translation import get_language
+
+try:
+    from django.utils.autoreload import file_changed
+
+except ImportError:  # pragma: nocover
+    # Django <2.2
+    file_changed = None
+
+from .caches import BoundedCache
+
+TRANSLATED_CACHE = BoundedCache(size=256)
+"""(choices list id, language) to (choices list, choices with evaluated titles) mapping.
+Also holds evaluated titles to values mappings for `ChoicesEnumMixin.get_value()`.
+
+"""
 
 
 class ChoicesEnumMixin:
@@ -40,20 +60,24 @@ class ChoicesEnumMixin:
     hints = None
     """Value to hint mapping."""
 
+    # Frozen lookup tables computed on first access (see `_get_lookup()`):
+    #   _titles_lookup - value and variant instance to title
+    #   _hints_lookup - value and variant instance to hint
+
     def __init__(self, *args):
 
         cls = self.__class__
         value = self.value
 
-        def contribute_to_mapping(name, val):
+        def contribute_to_mapping(name, val, key=value):
 
-            mapping = getattr(cls, name, None)
+            mapping = cls.__dict__.get(name)
 
             if mapping is None:
                 mapping = {}
                 setattr(cls, name, mapping)
 
-            mapping[value] = val
+            mapping[key] = val
 
         title = self.title
 
@@ -61,8 +85,10 @@ class ChoicesEnumMixin:
             title = self.name.lower().capitalize()
             self.title = title
 
+        hint = self.hint
+
         contribute_to_mapping('titles', title)
-        contribute_to_mapping('hints', self.hint)
+        contribute_to_mapping('hints', hint)
 
     def __new__(cls, *value):
         val = value[0]
@@ -98,6 +124,20 @@ class ChoicesEnumMixin:
         # Try to be compatible with integer fields and lookups.
         return int(self.value)
 
+    @classmethod
+    def _get_lookup(cls, name: str) -> Mapping:
+        # Titles are not touched here (e.g. hashed), so that lazy translations are not forced.
+        lookup = cls.__dict__.get(name)
+
+        if lookup is None:
+            source = cls.titles if name == '_titles_lookup' else cls.hints
+            lookup = dict(source)
+            lookup.update((member, source[member.value]) for member in cls)
+            lookup = MappingProxyType(lookup)
+            setattr(cls, name, lookup)
+
+        return lookup
+
     @classmethod
     def get_title(cls, item) -> str:
         """Returns a title for a variant instance or it's value.
@@ -105,10 +145,7 @@ class ChoicesEnumMixin:
         :param item:
 
         """
-        if isinstance(item, cls):
-            return item.title
-
-        return cls.titles[item]
+        return cls._get_lookup('_titles_lookup')[item]
 
     @classmethod
     def get_hint(cls, item) -> str:
@@ -117,10 +154,95 @@ class ChoicesEnumMixin:
         :param item:
 
         """
-        if isinstance(item, cls):
-            return item.hint
+        return cls._get_lookup('_hints_lookup')[item]
+
+    @classmethod
+    def get_titles(cls, items: Iterable) -> List[str]:
+        """Returns titles for a number of variant instances or values.
+
+        :param items:
+
+        """
+        return list(map(cls._get_lookup('_titles_lookup').__getitem__, items))
+
+    @classmethod
+    def get_hints(cls, items: Iterable) -> List[str]:
+        """Returns hints for a number of variant instances or values.
+
+        :param items:
+
+        """
+        return list(map(cls._get_lookup('_hints_lookup').__getitem__, items))
+
+    @classmethod
+    def get_value(cls, title: str) -> Any:
+        """Returns a value for a given title.
+        Titles are matched as evaluated for the currently active language.
+
+        :param title:
+
+        """
+        key = (id(cls), get_language(), 'values')
+        cached = TRANSLATED_CACHE.get(key)
+
+        if cached is not None and cached[0] is cls:
+            values = cached[1]
+
+        else:
+            values = MappingProxyType({title_: value for value, title_ in get_choices_translated(cls)})
+            TRANSLATED_CACHE.set(key, (cls, values))
+
+        return values[title]
+
+    @classmethod
+    def get_choices(cls) -> Tuple[Tuple[Any, Any], ...]:
+        """Returns model field choices. The result is computed only once.
+        See also `get_choices()` function.
+
+        """
+        choices = cls.__dict__.get('_choices')
+
+        if choices is None:
+            choices = tuple(cls.titles.items())
+            cls._choices = choices
+
+        return choices
+
+
+class ChoicesDict(dict):
+    """Immutable dictionary of choices as returned by `choices_list()`.
+
+    Being immutable it's safe to compute model field choices
+    from it only once (see `get_choices()`).
+
+    """
+    __slots__ = ['_choices']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._choices = None
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f'{self.__class__.__name__} is immutable')
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def get_choices(self) -> Tuple[Tuple[Any, Any], ...]:
+        """Returns model field choices. The result is computed only once.
+        See also `get_choices()` function.
+
+        """
+        choices = self._choices
+
+        if choices is None:
+            choices = tuple(self.items())
+            self._choices = choices
 
-        return cls.hints[item]
+        return choices
 
 
 def choices_list(*choices: Union[Set, List, Tuple, Dict]) -> dict:
@@ -129,7 +251,7 @@ def choices_list(*choices: Union[Set, List, Tuple, Dict]) -> dict:
 
     To be used in conjunction with `get_choices()`.
 
-    Returns choices ordered dictionary.
+    Returns choices ordered immutable dictionary.
 
     .. code-block:: python
 
@@ -151,17 +273,101 @@ def choices_list(*choices: Union[Set, List, Tuple, Dict]) -> dict:
     :param choices:
 
     """
-    return dict(choices)
+    return ChoicesDict(choices)
 
 
 def get_choices(choices_list: Union[Dict, Type[ChoicesEnumMixin]]) -> Tuple[Tuple[Any, Any], ...]:
     """Returns model field choices from a given choices list.
 
+    Results for `choices_list()` and `ChoicesEnumMixin` are computed only once.
+
     :param  choices_list:
         The list can be defined with `choices_list()` or could be an `ChoicesEnumMixin` and `Enum` subclass.
 
     """
-    if isinstance(choices_list, type) and issubclass(choices_list, ChoicesEnumMixin):
-        return tuple(choices_list.titles.items())
+    if isinstance(choices_list, ChoicesDict) or (
+        isinstance(choices_list, type) and issubclass(choices_list, ChoicesEnumMixin)
+    ):
+        return choices_list.get_choices()
 
     return tuple((key, val) for key, val in choices_list.items())
+
+
+def choices_display(field: str, choices_list: Union[Dict, Type[ChoicesEnumMixin]], default: str = '') -> Case:
+    """Returns an expression to get choices titles from DB, instead of mapping values in Python.
+
+    .. code-block:: python
+
+        rows = MyChoiceModel.objects.annotate(
+            role_title=choices_display('role', Role)
+        ).values_list('id', 'role_title')
+
+    :param field: Field name holding choices values.
+
+    :param choices_list:
+        The list can be defined with `choices_list()` or could be an `ChoicesEnumMixin` and `Enum` subclass.
+
+    :param default: Title for values not in the list.
+
+    """
+    return Case(
+        *(When(**{field: value}, then=Value(f'{title}')) for value, title in get_choices(choices_list)),
+        default=Value(default),
+        output_field=CharField(),
+    )
+
+
+def get_choices_translated(choices_list: Union[Dict, Type[ChoicesEnumMixin]]) -> Tuple[Tuple[Any, str], ...]:
+    """Returns choices from a given choices list with titles (e.g. lazy translation
+    proxies) evaluated for the currently active language.
+
+    Results for `choices_list()` and `ChoicesEnumMixin` are cached per language,
+    so that large selects could be rendered without forcing lazy strings
+    on every request.
+
+    .. code-block:: python
+
+        class MyForm(forms.Form):
+
+            role = forms.ChoiceField(choices=partial(get_choices_translated, Role))
+
+    :param  choices_list:
+        The list can be defined with `choices_list()` or could be an `ChoicesEnumMixin` and `Enum` subclass.
+
+    """
+    cacheable = isinstance(choices_list, ChoicesDict) or isinstance(choices_list, type)
+
+    if cacheable:
+        key = (id(choices_list), get_language())
+        cached = TRANSLATED_CACHE.get(key)
+
+        # Check identity as ids of collected objects could be reused.
+        if cached is not None and cached[0] is choices_list:
+            return cached[1]
+
+    choices = tuple((value, f'{title}') for value, title in get_choices(choices_list))
+
+    if cacheable:
+        TRANSLATED_CACHE.set(key, (choices_list, choices))
+
+    return choices
+
+
+def reset_translated_cache(sender=None, setting=None, file_path=None, **kwargs):
+    """Drops choices cached by `get_choices_translated()`.
+    Called automatically on translations reload.
+
+    """
+    if setting is not None and setting not in {'LANGUAGES', 'LANGUAGE_CODE', 'LOCALE_PATHS'}:
+        return
+
+    if file_path is not None and file_path.suffix != '.mo':
+        return
+
+    TRANSLATED_CACHE.clear()
+
+
+setting_changed.connect(reset_translated_cache, dispatch_uid='etc_choices_translated_cache')
+
+if file_changed is not None:
+    file_changed.connect(reset_translated_cache, dispatch_uid='etc_choices_translated_cache')
@@ -1,19 +1,94 @@
-from django.forms import Form
+from typing import Union
 
+from django.forms import Form, Widget
+from django.forms.formsets import BaseFormSet
 
-def set_form_widgets_attrs(form: Form, attrs: dict):
-    """Applies a given HTML attributes to each field widget of a given form.
+
+class WidgetsAttrs:
+    """HTML attributes precompiled to be applied to form fields widgets.
+    Compile once (e.g. at module level) and apply to a number of forms or formsets.
 
     Example:
 
-        set_form_widgets_attrs(my_form, {'class': 'clickable'})
+        ATTRS = WidgetsAttrs({'class': 'clickable', 'data-name': lambda field: field.label})
+
+        ATTRS.apply(my_formset)
 
     """
-    for _, field in form.fields.items():
-        attrs_ = dict(attrs)
+    __slots__ = ['template', 'dynamic', 'shared']
+
+    def __init__(self, attrs: dict, share: bool = False):
+        """
+        :param attrs: Attributes. Callables are called with a field object to get a value.
+
+        :param share: Allow widgets to share the same attributes dictionary
+            if there are no callables in attributes.
+            Use only if you're sure that widgets attributes won't be modified in place.
+
+        """
+        template = dict(attrs)
+        dynamic = tuple((name, val) for name, val in template.items() if callable(val))
+
+        self.template = template
+        """Attributes in the original order. Callables are placeholders for the values."""
+
+        self.dynamic = dynamic
+        """Callable attributes: (name, callable) tuples."""
+
+        self.shared = share and not dynamic
+
+    def get_attrs(self, field) -> dict:
+        """Returns attributes for a given field.
+
+        :param field:
+
+        """
+        if self.shared:
+            return self.template
+
+        attrs = self.template.copy()
+
+        for name, val in self.dynamic:
+            attrs[name] = val(field)
+
+        return attrs
 
-        for name, val in attrs.items():
-            if hasattr(val, '__call__'):
-                attrs_[name] = val(field)
+    def apply(self, form: Union[Form, BaseFormSet]):
+        """Applies attributes to each field widget of a given form
+        or of every form in a given formset.
+
+        :param form: Form or formset.
+
+        """
+        forms = form.forms if isinstance(form, BaseFormSet) else (form,)
+
+        get_attrs = self.get_attrs
+
+        for form in forms:
+            for field in form.fields.values():
+                widget = field.widget
+                attrs = get_attrs(field)
+
+                if type(widget).build_attrs is not Widget.build_attrs:
+                    # Respect customized widgets. Others would just copy attributes we already have.
+                    attrs = widget.build_attrs(attrs)
+
+                widget.attrs = attrs
+
+
+def set_form_widgets_attrs(form: Union[Form, BaseFormSet], attrs: Union[dict, WidgetsAttrs]):
+    """Applies a given HTML attributes to each field widget of a given form
+    (or of every form in a given formset).
+
+    Example:
+
+        set_form_widgets_attrs(my_form, {'class': 'clickable'})
+
+    :param form: Form or formset.
+    :param attrs: Attributes dictionary or precompiled `WidgetsAttrs`.
+
+    """
+    if not isinstance(attrs, WidgetsAttrs):
+        attrs = WidgetsAttrs(attrs)
 
-        field.widget.attrs = field.widget.build_attrs(attrs_)
+    attrs.apply(form)
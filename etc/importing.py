@@ -1,7 +1,11 @@
+import sys
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from importlib.util import find_spec, module_from_spec, LazyLoader
+from time import perf_counter
 from types import ModuleType
-from typing import Optional, List
-
-from django.utils.module_loading import module_has_submodule
+from typing import Optional, List, Dict, Tuple, Iterator
 
 try:
     from django.utils.module_loading import import_module
@@ -11,44 +15,346 @@ except ImportError:
     from django.utils.importlib import import_module
 
 
-def import_app_module(app_name: str, module_name: str) -> Optional[ModuleType]:
-    """Returns a module from a given app by its name.
+SUBMODULES_INDEX: Dict[Tuple[str, str], bool] = {}
+"""(app package name, module name) to module existence mapping.
+Filled in on discovery, so that every app package is scanned only once per process.
+
+"""
+
+IMPORT_TIMINGS: Dict[str, float] = {}
+"""Full module name to its import time (seconds) mapping for modules
+imported with `import_app_module()`. Allows to find slow importers.
+
+"""
+
+
+class ImportRecord:
+    """Module import profiling data."""
+
+    __slots__ = ['name', 'duration', 'memory', 'children']
+
+    def __init__(self, name: str):
+        self.name = name
+        self.duration = 0.0
+        """Wall time (seconds)."""
+
+        self.memory = 0
+        """Memory allocated (bytes)."""
+
+        self.children: List['ImportRecord'] = []
+        """Records for modules imported by this module."""
+
+    def __repr__(self):
+        return f'<ImportRecord: {self.name} {self.duration:.4f}s>'
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'duration': self.duration,
+            'memory': self.memory,
+            'children': [child.as_dict() for child in self.children],
+        }
+
+
+class ImportProfile:
+    """Import profiling results. See `profile_imports()`."""
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        """Records for modules imported by `import_app_module()`."""
+
+        self._stack: List[ImportRecord] = []
+
+    def get_top(self, count: int = None) -> List[ImportRecord]:
+        """Returns records sorted by import time, the slowest first.
+
+        :param count: Number of records to return. None - all.
+
+        """
+        return sorted(self.records, key=lambda record: record.duration, reverse=True)[:count]
+
+    @property
+    def active(self) -> bool:
+        """Whether a module import is being profiled now."""
+        return bool(self._stack)
+
+    @property
+    def current(self) -> Optional[str]:
+        """Name of a module being imported now."""
+        stack = self._stack
+        return stack[-1].name if stack else None
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[ImportRecord]:
+        """Measures a module import.
+
+        :param name: Full module name.
+
+        """
+        stack = self._stack
+        record = ImportRecord(name)
+
+        (stack[-1].children if stack else self.records).append(record)
+        stack.append(record)
+
+        tracing = tracemalloc.is_tracing()
+        memory = tracemalloc.get_traced_memory()[0] if tracing else 0
+        started = perf_counter()
+
+        try:
+            yield record
+
+        finally:
+            record.duration = perf_counter() - started
+
+            if tracing:
+                record.memory = tracemalloc.get_traced_memory()[0] - memory
+
+            stack.pop()
+
+
+class ProfilingFinder:
+    """Meta path finder wrapping loaders of modules imported
+    during profiling to measure their execution.
+
+    """
+    def __init__(self, profile: ImportProfile):
+        self.profile = profile
+
+    def find_spec(self, fullname, path=None, target=None):
+        profile = self.profile
+
+        if not profile.active or profile.current == fullname:
+            return None
+
+        for finder in sys.meta_path:
+
+            find_spec = getattr(finder, 'find_spec', None)
+
+            if finder is self or find_spec is None:
+                continue
+
+            spec = find_spec(fullname, path, target)
+
+            if spec is not None:
+                break
+
+        else:
+            return None
+
+        loader = spec.loader
+
+        if loader is None or not hasattr(loader, 'exec_module'):
+            return spec
+
+        spec.loader = ProfilingLoader(loader, profile)
+
+        return spec
+
+
+class ProfilingLoader:
+    """Loader wrapper measuring module execution."""
+
+    def __init__(self, loader, profile: ImportProfile):
+        self.loader = loader
+        self.profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        loader = self.loader
+
+        # Restore the original loader not to affect the module in any way.
+        module.__loader__ = loader
+        module.__spec__.loader = loader
+
+        with self.profile.measure(module.__name__):
+            loader.exec_module(module)
+
+
+PROFILE: Optional[ImportProfile] = None
+"""Import profile currently active. See `profile_imports()`."""
+
+
+@contextmanager
+def profile_imports(trace_memory: bool = True) -> Iterator[ImportProfile]:
+    """Profiles modules imports made with `import_app_module()` and `import_project_modules()`
+    recording wall time, memory allocated and nested imports.
+
+    .. warning:: Not thread-safe. Slows down imports. Use for diagnostics only.
+
+    Example:
+
+        with profile_imports() as profile:
+            import_project_modules('mymodule')
+
+        for record in profile.get_top(10):
+            print(record.name, record.duration)
+
+    :param trace_memory: Whether to trace memory allocations (using `tracemalloc`).
+
+    """
+    global PROFILE
+
+    profile = ImportProfile()
+    finder = ProfilingFinder(profile)
+    start_tracing = trace_memory and not tracemalloc.is_tracing()
+
+    if start_tracing:
+        tracemalloc.start()
+
+    sys.meta_path.insert(0, finder)
+    PROFILE = profile
+
+    try:
+        yield profile
+
+    finally:
+        PROFILE = None
+        sys.meta_path.remove(finder)
+
+        if start_tracing:
+            tracemalloc.stop()
+
+
+def get_app_package_name(app_name: str) -> str:
+    """Returns app package name for a given app name
+    (which can be app config class path).
 
     :param app_name:
-    :param module_name:
 
     """
     name_split = app_name.split('.')
     if name_split[-1][0].isupper():  # Seems that we have app config class path here.
         app_name = '.'.join(name_split[:-2])
 
-    module = import_module(app_name)
+    return app_name
+
+
+def has_app_module(app_name: str, module_name: str) -> bool:
+    """Returns flag whether an app has a module with the given name.
+    The module itself is not imported.
+
+    :param app_name:
+    :param module_name:
+
+    """
+    app_name = get_app_package_name(app_name)
+    key = (app_name, module_name)
+
+    exists = SUBMODULES_INDEX.get(key)
+
+    if exists is None:
+        try:
+            exists = find_spec(f'{app_name}.{module_name}') is not None
+
+        except ModuleNotFoundError:
+            # Some intermediate package is missing.
+            exists = False
+
+        SUBMODULES_INDEX[key] = exists
+
+    return exists
+
+
+def import_module_lazy(name: str) -> ModuleType:
+    """Returns a module which is actually imported (executed)
+    only on the first attribute access.
+
+    :param name: Full module name.
+
+    """
+    module = sys.modules.get(name)
+
+    if module is not None:
+        return module
+
+    spec = find_spec(name)
 
     try:
-        sub_module = import_module(f'{app_name}.{module_name}')
-        return sub_module
+        loader = LazyLoader(spec.loader)
+
+    except TypeError:  # pragma: nocover
+        # Loader doesn't support lazy loading (e.g. extension module).
+        return import_module(name)
 
-    except:
+    spec.loader = loader
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
 
-        # The same bubbling strategy as in autodiscover_modules().
-        if module_has_submodule(module, module_name):  # Module is in a package.
-            raise
+    # Bind to parent as import does.
+    parent_name, _, child_name = name.rpartition('.')
+    setattr(sys.modules[parent_name], child_name, module)
+
+    return module
+
+
+def import_app_module(app_name: str, module_name: str, lazy: bool = False) -> Optional[ModuleType]:
+    """Returns a module from a given app by its name.
+
+    :param app_name:
+    :param module_name:
+    :param lazy: Return a lazy module, which is actually imported only on the first attribute access.
 
+    """
+    app_name = get_app_package_name(app_name)
+
+    import_module(app_name)
+
+    if not has_app_module(app_name, module_name):
         return None
 
+    full_name = f'{app_name}.{module_name}'
+
+    if lazy:
+        return import_module_lazy(full_name)
+
+    # The module is in a package, so import errors bubble up as in autodiscover_modules().
+    started = perf_counter()
+
+    if PROFILE is None:
+        sub_module = import_module(full_name)
+
+    else:
+        with PROFILE.measure(full_name):
+            sub_module = import_module(full_name)
 
-def import_project_modules(module_name: str) -> List[ModuleType]:
+    IMPORT_TIMINGS.setdefault(full_name, perf_counter() - started)
+
+    return sub_module
+
+
+def import_project_modules(module_name: str, lazy: bool = False) -> List[ModuleType]:
     """Imports modules from registered apps using given module name
     and returns them as a list.
 
     :param module_name:
+    :param lazy: Return lazy modules, which are actually imported only on the first attribute access.
+        Handy to speed up startup when only a few of modules are really used.
 
     """
     from django.conf import settings
 
+    apps = [get_app_package_name(app) for app in settings.INSTALLED_APPS]
+
+    # Apps not scanned yet are scanned in parallel, the scan involves no modules import.
+    apps_unknown = [app for app in apps if (app, module_name) not in SUBMODULES_INDEX]
+
+    if len(apps_unknown) > 1:
+        for app in apps_unknown:
+            import_module(app)
+
+        with ThreadPoolExecutor(max_workers=min(8, len(apps_unknown))) as executor:
+            list(executor.map(lambda app: has_app_module(app, module_name), apps_unknown))
+
     submodules = []
-    for app in settings.INSTALLED_APPS:
-        module = import_app_module(app, module_name)
+    for app in apps:
+        module = import_app_module(app, module_name, lazy=lazy)
         if module is not None:
             submodules.append(module)
 
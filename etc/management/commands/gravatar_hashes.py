@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import GravatarHashField, get_model_class_from_string
+
+
+class Command(BaseCommand):
+
+    help = 'Calculates and stores Gravatar hashes for objects of a model having GravatarHashField.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', default=settings.AUTH_USER_MODEL,
+            help='Model to fill in hashes for in `app_label.ModelName` format. Default: user model.')
+
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of objects to fetch and update at once.')
+
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recalculate all hashes. By default only empty hashes are calculated.')
+
+    def handle(self, *args, **options):
+        model = get_model_class_from_string(options['model'])
+        field_name = GravatarHashField.get_field_name(model)
+
+        if field_name is None:
+            raise CommandError(f'`{options["model"]}` model has no GravatarHashField.')
+
+        field = model._meta.get_field(field_name)
+        batch_size = options['batch_size']
+
+        manager = model._default_manager
+        objects = manager.all()
+
+        if not options['all']:
+            objects = objects.filter(**{field_name: ''})
+
+        fields = [model._meta.pk.attname, field_name]
+        # Source may contain any attributes (e.g. properties), only columns are fetched.
+        concrete = {field_.name for field_ in model._meta.concrete_fields}
+        fields.extend(attr for attr in field.source if attr in concrete)
+
+        batch = []
+        updated = 0
+
+        def flush():
+            if hasattr(manager, 'bulk_update'):
+                manager.bulk_update(batch, [field_name], batch_size=batch_size)
+
+            else:  # pragma: nocover
+                # Django <2.2
+                for obj in batch:
+                    obj.save(update_fields=[field_name])
+
+            batch.clear()
+
+        for obj in objects.only(*fields).iterator(chunk_size=batch_size):
+            value = field.calculate(obj)
+
+            if value == getattr(obj, field_name):
+                continue
+
+            setattr(obj, field_name, value)
+            batch.append(obj)
+            updated += 1
+
+            if len(batch) >= batch_size:
+                flush()
+
+        if batch:
+            flush()
+
+        return f'Hashes updated: {updated}'
@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from ...importing import import_project_modules, profile_imports
+
+
+class Command(BaseCommand):
+
+    help = 'Profiles import of modules with the given names from all registered apps.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('module_names', nargs='+', help='Names of modules to import from apps.')
+
+        parser.add_argument(
+            '--top', type=int, default=20,
+            help='Number of the slowest modules to output.')
+
+        parser.add_argument(
+            '--format', choices=['table', 'json'], default='table',
+            help='Output format.')
+
+        parser.add_argument(
+            '--no-memory', action='store_true',
+            help='Do not trace memory allocations.')
+
+    def handle(self, *args, **options):
+
+        with profile_imports(trace_memory=not options['no_memory']) as profile:
+            for module_name in options['module_names']:
+                import_project_modules(module_name)
+
+        records = profile.get_top(options['top'])
+
+        if options['format'] == 'json':
+            return json.dumps([record.as_dict() for record in records], indent=2)
+
+        def count_nested(record):
+            return sum(1 + count_nested(child) for child in record.children)
+
+        lines = [f'{"Module":<60} {"Time, ms":>10} {"Memory, KiB":>12} {"Nested":>7}']
+
+        for record in records:
+            lines.append(
+                f'{record.name:<60} {record.duration * 1000:>10.2f} '
+                f'{record.memory / 1024:>12.1f} {count_nested(record):>7}'
+            )
+
+        return '\n'.join(lines)
@@ -0,0 +1,132 @@
+from typing import Dict, Optional
+
+from django.core.paginator import Page
+from django.core.signals import setting_changed
+from django.db.models.query import QuerySet
+from django.utils.translation import get_language
+
+try:
+    from django.utils.autoreload import file_changed
+
+except ImportError:  # pragma: nocover
+    # Django <2.2
+    file_changed = None
+
+from .caches import BoundedCache
+
+MODELS_META = BoundedCache(size=512)
+"""(model class, language) to model metadata (see ModelMeta) mapping.
+Filled in lazily on first access.
+
+"""
+
+
+class FieldTexts:
+    """Model field texts evaluated for a certain language."""
+
+    __slots__ = ['verbose_name', 'help_text']
+
+    def __init__(self, verbose_name: str, help_text: str):
+        self.verbose_name = verbose_name
+        self.help_text = help_text
+
+
+class ModelMeta:
+    """Model texts evaluated for a certain language."""
+
+    __slots__ = ['model', 'language', 'verbose_name', 'verbose_name_plural', 'fields']
+
+    def __init__(self, model, language: Optional[str]):
+        opts = model._meta
+
+        self.model = model
+        self.language = language
+        self.verbose_name = f'{opts.verbose_name}'
+        self.verbose_name_plural = f'{opts.verbose_name_plural}'
+
+        fields: Dict[str, FieldTexts] = {}
+
+        for field in (*opts.fields, *opts.many_to_many, *opts.private_fields):
+            verbose_name = getattr(field, 'verbose_name', None)
+
+            if verbose_name is None:
+                # E.g. generic foreign keys.
+                continue
+
+            texts = FieldTexts(f'{verbose_name}', f'{field.help_text}')
+
+            fields[field.name] = texts
+            fields.setdefault(getattr(field, 'attname', field.name), texts)
+
+        self.fields = fields
+        """Field name (or attribute name) to field texts mapping."""
+
+    def __repr__(self):
+        return f'<ModelMeta: {self.model.__name__} {self.language}>'
+
+
+def get_model(value):
+    """Returns a model class for a given model instance, QuerySet or Page.
+
+    :param value:
+
+    """
+    # Allow operations on homogeneous sets -- Pages and Query Sets.
+    if isinstance(value, Page):
+        value = value.object_list
+
+    if isinstance(value, QuerySet):
+        value = value.model
+
+    if not isinstance(value, type):
+        value = value.__class__
+
+    return value
+
+
+def get_model_meta(model) -> ModelMeta:
+    """Returns model texts (verbose names, fields verbose names and help texts)
+    evaluated for the currently active language.
+
+    Results are cached per model and language, so that lazy translations
+    are not forced on every access.
+
+    .. code-block:: python
+
+        meta = get_model_meta(MyModel)
+        meta.verbose_name_plural
+        meta.fields['title'].help_text
+
+    :param model: Model class, model instance, QuerySet or Page.
+
+    """
+    model = get_model(model)
+    key = (model, get_language())
+
+    meta = MODELS_META.get(key)
+
+    if meta is None:
+        meta = ModelMeta(model, key[1])
+        MODELS_META.set(key, meta)
+
+    return meta
+
+
+def reset_models_meta(sender=None, setting=None, file_path=None, **kwargs):
+    """Drops models texts cached by `get_model_meta()`.
+    Called automatically on translations reload.
+
+    """
+    if setting is not None and setting not in {'LANGUAGES', 'LANGUAGE_CODE', 'LOCALE_PATHS', 'USE_I18N'}:
+        return
+
+    if file_path is not None and file_path.suffix != '.mo':
+        return
+
+    MODELS_META.clear()
+
+
+setting_changed.connect(reset_models_meta, dispatch_uid='etc_models_meta')
+
+if file_changed is not None:
+    file_changed.connect(reset_models_meta, dispatch_uid='etc_models_meta')
@@ -0,0 +1,21 @@
+from django.db import models
+
+from .models import GravatarHashField
+
+
+class GravatarHashMixin(models.Model):
+    """Mix in this class into your user model to store Gravatar hashes
+    and speed up Gravatar template tags.
+
+    Use `gravatar_hashes` management command to fill in hashes for existing objects.
+
+    Example:
+
+        class MyUser(GravatarHashMixin, AbstractUser):
+            ...
+
+    """
+    gravatar_hash = GravatarHashField('Gravatar hash')
+
+    class Meta:
+        abstract = True
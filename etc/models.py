@@ -1,8 +1,10 @@
+from hashlib import md5
 from types import ModuleType
-from typing import Type
+from typing import Type, Optional, Tuple
 
 from django.apps import apps
 from django.core.exceptions import ImproperlyConfigured
+from django.db import models
 from django.db.models.base import ModelBase, Model
 
 
@@ -82,6 +84,88 @@ class InheritedModel(metaclass=InheritedModelMetaclass):
     """
 
 
+class GravatarHashField(models.CharField):
+    """Stores Gravatar hash (md5 hex digest) of a model instance email
+    (or username if email is empty), updating it on every save.
+
+    Gravatar template tags prefer stored hashes when available.
+
+    Example:
+
+        class MyUser(AbstractUser):
+
+            gravatar_hash = GravatarHashField()
+
+    """
+    _models_fields = {}
+
+    def __init__(self, *args, source: Tuple[str, ...] = ('email', 'username'), **kwargs):
+        """
+        :param source: Names of model attributes to get a value to hash from.
+            The first non-empty value is used.
+
+        """
+        self.source = source
+
+        kwargs.setdefault('max_length', 32)
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('default', '')
+
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+
+        if self.source != ('email', 'username'):
+            kwargs['source'] = self.source
+
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance: Model, add: bool) -> str:
+        value = self.calculate(model_instance)
+        setattr(model_instance, self.attname, value)
+        return value
+
+    def calculate(self, model_instance: Model) -> str:
+        """Returns Gravatar hash for a given model instance.
+
+        :param model_instance:
+
+        """
+        for attr in self.source:
+            value = getattr(model_instance, attr, None)
+
+            if value:
+                return self.get_hash(value)
+
+        return ''
+
+    @staticmethod
+    def get_hash(value: str) -> str:
+        """Returns Gravatar hash for a given email (or any other string).
+
+        :param value:
+
+        """
+        return md5(value.strip().lower().encode()).hexdigest()
+
+    @classmethod
+    def get_field_name(cls, model: Type[Model]) -> Optional[str]:
+        """Returns a name of Gravatar hash field for a given model
+        or None if there is no such a field.
+
+        :param model:
+
+        """
+        fields = cls._models_fields
+
+        if model not in fields:
+            fields[model] = next((field.attname for field in model._meta.fields if isinstance(field, cls)), None)
+
+        return fields[model]
+
+
 def get_model_class_from_string(model_path: str) -> Type[Model]:
     """Returns a certain model as defined in a string formatted `<app_name>.<model_name>`.
 
@@ -1,11 +1,32 @@
-from functools import partial
 from os import environ
-from typing import Optional
+from typing import Optional, Tuple, Iterable, Iterator, Union
+from urllib.parse import urlsplit
 
 from django.conf import settings
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.signals import setting_changed
+from django.db.models import Model
+from django.db.models.signals import post_save, post_delete
 from django.http import HttpRequest
 
+try:
+    from asgiref.sync import sync_to_async
+
+except ImportError:  # pragma: nocover
+    # Django <3.0
+    sync_to_async = None
+
+from .caches import BoundedCache
+
+SITE_SETTINGS = ('SITE_URL', 'SITE_DOMAIN', 'SITE_PROTO', 'SITE_SCHEME')
+"""Names of environment variables and settings used to get site URL."""
+
+SETTINGS_CACHE = BoundedCache(size=16)
+"""Environment variables and settings values to (scheme, domain) deduced from them."""
+
+HOSTS_CACHE = BoundedCache(size=256)
+"""Request host to domain mapping for domains got from Django Sites contrib."""
+
 
 class DomainGetter:
 
@@ -18,20 +39,55 @@ class DomainGetter:
         return self.domain
 
 
-def get_site_url(request: HttpRequest = None) -> str:
-    """Tries to get a site URL from environment and settings
-    in the following order:
+def reset_site_url_cache(sender=None, setting=None, **kwargs):
+    """Drops cached site URL data.
+    Called automatically on settings change (e.g. in tests).
 
-    1. (SITE_PROTO / SITE_SCHEME) + SITE_DOMAIN
-    2. SITE_URL
-    3. Django Sites contrib
-    4. Request object
+    """
+    if setting is None or setting in SITE_SETTINGS:
+        SETTINGS_CACHE.clear()
+
+    if setting is None or setting == 'SITE_ID':
+        HOSTS_CACHE.clear()
+
+
+def reset_site_hosts_cache(sender=None, **kwargs):
+    """Drops domains cached for hosts.
+    Called automatically on Site objects change.
+
+    """
+    if sender is not None and sender._meta.label_lower != 'sites.site':
+        return
+
+    HOSTS_CACHE.clear()
 
-    :param request: Request object to deduce URL from.
+
+setting_changed.connect(reset_site_url_cache, dispatch_uid='etc_site_url_cache')
+# Senders are filtered in receiver, since Sites contrib is not required to be installed.
+post_save.connect(reset_site_hosts_cache, dispatch_uid='etc_site_hosts_cache')
+post_delete.connect(reset_site_hosts_cache, dispatch_uid='etc_site_hosts_cache')
+
+
+def get_site_url_settings() -> Tuple[Optional[str], Optional[str]]:
+    """Returns (scheme, domain) tuple deduced from environment and settings.
+    None is returned for a part unable to deduce.
+
+    Results are cached, environment and settings values are checked on every call,
+    so that settings changed directly (without `setting_changed` signal) are respected.
 
     """
-    env = partial(environ.get)
-    settings_ = partial(getattr, settings)
+    env_values = tuple(environ.get(name, None) for name in SITE_SETTINGS)
+    settings_values = tuple(getattr(settings, name, None) for name in SITE_SETTINGS)
+
+    key = env_values + settings_values
+
+    cached = SETTINGS_CACHE.get(key)
+
+    if cached is not None:
+        return cached
+
+    env = {name: value for name, value in zip(SITE_SETTINGS, env_values) if value is not None}.get
+    settings_ = {name: value for name, value in zip(SITE_SETTINGS, settings_values) if value is not None}.get
 
     domain = None
     scheme = None
@@ -50,10 +106,120 @@ def get_site_url(request: HttpRequest = None) -> str:
     if domain is None and url is not None:
         scheme, domain = url.split('://')[:2]
 
+    cached = (scheme, domain)
+    SETTINGS_CACHE.set(key, cached)
+
+    return cached
+
+
+def get_site_domain(request: HttpRequest = None) -> str:
+    """Returns a domain for the current site using Django Sites contrib.
+
+    Results are cached per request host (if SITE_ID is not set)
+    and invalidated on Site objects change.
+
+    :param request: Request object to deduce site from.
+
+    """
+    host = get_site_host(request)
+
+    domain = HOSTS_CACHE.get(host)
+
     if domain is None:
-        site = get_current_site(request or DomainGetter(domain))
+        domain = get_current_site(request or DomainGetter(None)).domain
+        HOSTS_CACHE.set(host, domain)
+
+    return domain
+
+
+async def aget_site_domain(request: HttpRequest = None) -> str:
+    """Asynchronous version of `get_site_domain()`.
+
+    Django Sites contrib is queried only on cache miss.
+
+    :param request: Request object to deduce site from.
+
+    """
+    host = get_site_host(request)
+
+    domain = HOSTS_CACHE.get(host)
+
+    if domain is None:
+        request = request or DomainGetter(None)
+
+        if sync_to_async is None:  # pragma: nocover
+            site = get_current_site(request)
+
+        else:
+            # Only cache misses go to Django Sites contrib (in a thread).
+            site = await sync_to_async(get_current_site)(request)
+
         domain = site.domain
+        HOSTS_CACHE.set(host, domain)
+
+    return domain
+
+
+def get_site_host(request: HttpRequest = None) -> Optional[str]:
+    """Returns a host to cache a site domain for.
+    None is returned if site does not depend on request.
+
+    :param request: Request object.
 
+    """
+    if request and not getattr(settings, 'SITE_ID', None):
+        # Site is looked up by host.
+        return request.get_host()
+
+    return None
+
+
+def get_site_url(request: HttpRequest = None) -> str:
+    """Tries to get a site URL from environment and settings
+    in the following order:
+
+    1. (SITE_PROTO / SITE_SCHEME) + SITE_DOMAIN
+    2. SITE_URL
+    3. Django Sites contrib
+    4. Request object
+
+    :param request: Request object to deduce URL from.
+
+    """
+    scheme, domain = get_site_url_settings()
+
+    if domain is None:
+        domain = get_site_domain(request)
+
+    return build_site_url(scheme, domain, request)
+
+
+async def aget_site_url(request: HttpRequest = None) -> str:
+    """Asynchronous version of `get_site_url()`.
+
+    Environment and settings are used without any thread hops,
+    Django Sites contrib is queried asynchronously only when needed.
+
+    :param request: Request object to deduce URL from.
+
+    """
+    scheme, domain = get_site_url_settings()
+
+    if domain is None:
+        domain = await aget_site_domain(request)
+
+    return build_site_url(scheme, domain, request)
+
+
+def build_site_url(scheme: Optional[str], domain: Optional[str], request: HttpRequest = None) -> str:
+    """Returns site URL made of the given parts, using defaults
+    for those not set.
+
+    :param scheme:
+    :param domain:
+    :param request: Request object to deduce scheme from.
+
+    """
     if scheme is None and request:
         scheme = request.scheme
 
@@ -66,3 +232,52 @@ def get_site_url(request: HttpRequest = None) -> str:
     domain = domain.rstrip('/')
 
     return f'{scheme}://{domain}'
+
+
+def get_absolute_url(item: Union[str, Model], base: str = None) -> str:
+    """Returns an absolute URL for a given path or a model instance
+    (using its `get_absolute_url()`).
+
+    Example:
+
+        url = get_absolute_url('/some/path/')  # http://example.com/some/path/
+
+    :param item: Path or model instance.
+    :param base: Site URL. If not set `get_site_url()` is used.
+
+    """
+    if not isinstance(item, str):
+        item = item.get_absolute_url()
+
+    if urlsplit(item).netloc:
+        # Already absolute (or scheme-relative).
+        return item
+
+    if base is None:
+        base = get_site_url()
+
+    if item[:1] == '/':
+        return base + item
+
+    return f'{base}/{item}'
+
+
+def iter_absolute_urls(items: Iterable[Union[str, Model]], request: HttpRequest = None) -> Iterator[str]:
+    """Yields absolute URLs for given paths or model instances
+    (using their `get_absolute_url()`). Site URL is resolved only once.
+
+    Handy for sitemaps, feeds, emails and alike.
+
+    Example:
+
+        for url in iter_absolute_urls(MyModel.objects.iterator()):
+            ...
+
+    :param items: Paths or model instances.
+    :param request: Request object to deduce site URL from.
+
+    """
+    base = get_site_url(request)
+
+    for item in items:
+        yield get_absolute_url(item, base=base)
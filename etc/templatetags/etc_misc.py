@@ -1,10 +1,15 @@
-from copy import deepcopy
 from functools import partial
+from typing import Iterator, Union
 
 from django import template
+from django.conf import settings
+from django.http import HttpRequest
 from django.template import TemplateDoesNotExist
-from django.template.base import Lexer, Parser
+from django.template.base import Lexer, Parser, Template
+from django.template.context import make_context
+from django.template.loader import get_template
 from django.template.loader_tags import do_include, Node
+from django.template.loaders.cached import Loader as CachedLoader
 
 try:
     from django.template.loader_tags import construct_relative_path
@@ -16,11 +21,138 @@ try:
 except ImportError:
     construct_relative_path_ = lambda parser, name: name  # Sorry sub here for now.
 
-from ..toolbox import get_site_url
+try:
+    from django.utils.autoreload import file_changed
+
+except ImportError:  # pragma: nocover
+    # Django <2.2
+    file_changed = None
+
+from ..caches import BoundedCache
+from ..toolbox import get_site_url, get_absolute_url
 
 get_lexer = partial(Lexer)
 register = template.Library()
 
+TEMPLATES_CACHE = BoundedCache(size=getattr(settings, 'ETC_INCLUDE_CACHE_SIZE', 128))
+"""Resolved template names to compiled templates mapping used by `include_`.
+Used only for engines caching templates themselves (see `is_engine_caching()`).
+
+"""
+
+MISSING_CACHE = BoundedCache(
+    size=getattr(settings, 'ETC_INCLUDE_MISSING_CACHE_SIZE', 512),
+    ttl=getattr(settings, 'ETC_INCLUDE_MISSING_CACHE_TTL', None),
+)
+"""Resolved template names known to be missing, so that `include_` goes for a fallback straight away.
+Used only for engines caching templates themselves (see `is_engine_caching()`).
+
+"""
+
+
+RENDER_CACHE_KEY = 'etc_include_templates'
+"""Render context key for templates cached by `include_` for the current render only."""
+
+
+def is_engine_caching(engine) -> bool:
+    """Returns flag whether a given template engine caches compiled templates itself,
+    so that `include_` may cache templates process-wide too.
+
+    :param engine:
+
+    """
+    if engine.debug:
+        return False
+
+    return any(isinstance(loader, CachedLoader) for loader in engine.template_loaders)
+
+
+def reset_templates_cache(sender=None, file_path=None, **kwargs):
+    """Drops compiled and missing templates cached by `include_`.
+    Called automatically on templates change by development server autoreloader.
+
+    """
+    if file_path is not None and file_path.suffix == '.py':
+        return
+
+    TEMPLATES_CACHE.clear()
+    MISSING_CACHE.clear()
+
+
+if file_changed is not None:
+    file_changed.connect(reset_templates_cache, dispatch_uid='etc_include_templates_cache')
+
+
+def stream_template(
+    template_name: Union[str, Template],
+    context: dict = None,
+    request: HttpRequest = None,
+    using: str = None
+) -> Iterator[str]:
+    """Renders a template as an iterator of chunks rather than one string.
+    Output of `include_` tags found in template (and templates it includes) is streamed.
+
+    Can be used to pass large pages to StreamingHttpResponse with flat memory.
+
+    Example:
+
+        response = StreamingHttpResponse(stream_template('export.html', {'rows': rows}))
+
+    :param template_name: Template name or template object.
+    :param context: Context dictionary.
+    :param request: Request object.
+    :param using: Template engine name.
+
+    """
+    template = template_name
+
+    if isinstance(template, str):
+        template = get_template(template, using=using)
+
+    # Use the base.Template of a backends.django.Template.
+    template_ = getattr(template, 'template', template)
+
+    context = make_context(context, request, autoescape=template_.engine.autoescape)
+
+    return iter_template(template_, context)
+
+
+def iter_template(template: Template, context) -> Iterator[str]:
+    """Yields rendered template chunks node by node.
+    Similar to Template.render().
+
+    :param template:
+    :param context:
+
+    """
+    with context.render_context.push_state(template):
+
+        if context.template is None:
+            with context.bind_template(template):
+                context.template_name = template.name
+                yield from iter_nodelist(template.nodelist, context)
+
+        else:
+            yield from iter_nodelist(template.nodelist, context)
+
+
+def iter_nodelist(nodelist, context) -> Iterator[str]:
+    """Yields rendered nodes one by one. Nodes supporting streaming
+    (having `render_iter` method) yield their own chunks.
+
+    :param nodelist:
+    :param context:
+
+    """
+    for node in nodelist:
+        render_iter = getattr(node, 'render_iter', None)
+
+        if render_iter is None:
+            yield node.render_annotated(context)
+
+        else:
+            yield from render_iter(context)
+
 
 @register.simple_tag(takes_context=True)
 def site_url(context):
@@ -37,6 +169,33 @@ def site_url(context):
     return get_site_url(request=context.get('request', None))
 
 
+@register.filter('site_url')
+def site_url_filter(value, base=None):
+    """Prefixes a given path (or model instance URL) with a site URL.
+
+    See toolbox.get_absolute_url() for description.
+
+    .. note:: Filters have no access to a request, so site URL is deduced
+        from environment, settings and Django Sites contrib (requires SITE_ID).
+        Pass a site URL got from `site_url` tag as an argument to
+        use the request and to resolve the URL only once.
+
+    Example:
+
+        {% load etc_misc %}
+        {{ "/some/path/"|site_url }}
+        {{ my_model|site_url }}
+
+        {% site_url as base %}
+        {% for item in items %}{{ item|site_url:base }}{% endfor %}
+
+    """
+    if not value:
+        return ''
+
+    return get_absolute_url(value, base=base or None)
+
+
 class DynamicIncludeNode(Node):
 
     context_key = '__include_context'
@@ -46,28 +205,81 @@ class DynamicIncludeNode(Node):
         self.template = template
         self.extra_context = kwargs.pop('extra_context', {})
         self.isolated_context = kwargs.pop('isolated_context', False)
+        # Template name expression is compiled only once, and only rendered later.
+        self.template_name = Parser(get_lexer(template.var).tokenize()).parse()
         super(DynamicIncludeNode, self).__init__(*args, **kwargs)
 
-    def render_(self, tpl_new, context):
+    @staticmethod
+    def get_template(template_name, context):
+        """Returns compiled template for the given name, using process-wide cache
+        if the template engine caches templates itself (see `is_engine_caching()`).
+        Otherwise templates are cached only for the current render.
 
-        template = deepcopy(self.template)  # Do not mess with global template for threadsafety.
-        template.var = tpl_new  # Cheat a little
+        Raises TemplateDoesNotExist without touching template loaders
+        for names already known to be missing.
 
-        # Below is implementation from Django 2.1 generic IncludeNode.
+        :param template_name:
+        :param context:
 
-        template = template.resolve(context)
-        # Does this quack like a Template?
-        if not callable(getattr(template, 'render', None)):
-            # If not, try the cache and get_template().
-            template_name = template
-            cache = context.render_context.dicts[0].setdefault(self, {})
+        """
+        engine = context.template.engine
+        key = (engine, template_name)
+
+        caching = is_engine_caching(engine)
+
+        if caching:
+            template = TEMPLATES_CACHE.get(key)
+
+        else:
+            cache = context.render_context.dicts[0].setdefault(RENDER_CACHE_KEY, {})
             template = cache.get(template_name)
-            if template is None:
-                template = context.template.engine.get_template(template_name)
+
+        if template is None:
+
+            # Missing templates may appear any time in debug mode (and for engines with no cached loader).
+            if caching and MISSING_CACHE.get(key):
+                raise TemplateDoesNotExist(template_name)
+
+            try:
+                template = engine.get_template(template_name)
+
+            except TemplateDoesNotExist:
+                if caching:
+                    MISSING_CACHE.set(key, True)
+                raise
+
+            if caching:
+                TEMPLATES_CACHE.set(key, template)
+
+            else:
                 cache[template_name] = template
+
+        return template
+
+    def resolve_template(self, template, context):
+        """Returns compiled template for the given template name or template object.
+
+        :param template:
+        :param context:
+
+        """
+        # Does this quack like a Template?
+        if not callable(getattr(template, 'render', None)):
+            # If not, it's a name: try the cache and get_template().
+            template = self.get_template(template, context)
+
         # Use the base.Template of a backends.django.Template.
         elif hasattr(template, 'template'):
             template = template.template
+
+        return template
+
+    def render_(self, template, context):
+        # Node state is never modified here, so the node is safe to be shared between threads.
+        template = self.resolve_template(template, context)
+
+        # Below is implementation from Django 2.1 generic IncludeNode.
+
         values = {
             name: var.resolve(context)
             for name, var in self.extra_context.items()
@@ -81,9 +293,7 @@ class DynamicIncludeNode(Node):
         render_ = self.render_
 
         try:
-            return render_(
-                tpl_new=Parser(get_lexer(self.template.var).tokenize()).parse().render(context),
-                context=context)
+            return render_(template=self.template_name.render(context), context=context)
 
         except TemplateDoesNotExist:
             fallback = self.fallback
@@ -91,7 +301,108 @@ class DynamicIncludeNode(Node):
             if not fallback:  # pragma: nocover
                 raise
 
-            return render_(tpl_new=fallback.var, context=context)
+            return render_(template=fallback.resolve(context), context=context)
+
+    def render_iter(self, context):
+        """Yields rendered chunks instead of a string. Used for streaming (see `stream_template()`).
+
+        .. note:: Fallback is only used if the template itself is missing.
+
+        :param context:
+
+        """
+        try:
+            template = self.resolve_template(self.template_name.render(context), context)
+
+        except TemplateDoesNotExist:
+            fallback = self.fallback
+
+            if not fallback:
+                raise
+
+            template = self.resolve_template(fallback.resolve(context), context)
+
+        values = {
+            name: var.resolve(context)
+            for name, var in self.extra_context.items()
+        }
+
+        if self.isolated_context:
+            yield from iter_template(template, context.new(values))
+            return
+
+        with context.push(**values):
+            yield from iter_template(template, context)
+
+
+class DynamicIncludeBatchNode(DynamicIncludeNode):
+    """Renders a dynamically included template for every item of an iterable."""
+
+    def __init__(self, template, *args, **kwargs):
+        self.loopvar = kwargs.pop('loopvar')
+        self.items = kwargs.pop('items')
+        super(DynamicIncludeBatchNode, self).__init__(template, *args, **kwargs)
+
+    def render(self, context):
+        return ''.join(self.render_iter(context, stream=False))
+
+    def render_iter(self, context, stream=True):
+        """Yields rendered chunks for every item.
+
+        :param context:
+        :param stream: Whether to stream included templates output.
+
+        """
+        items = self.items.resolve(context, ignore_failures=True)
+
+        if not items:
+            return
+
+        loopvar = self.loopvar
+        template_name = self.template_name
+        extra_context = self.extra_context.items()
+        fallback = self.fallback
+
+        templates = {}
+
+        with context.push() as values:
+            # The same context layer is reused for all the items.
+            # Isolated context gets the loop variable and `with` values only.
+            target_values = {} if self.isolated_context else values
+            target_context = context.new(target_values) if self.isolated_context else context
+
+            for item in items:
+                # Previous item values are dropped not to leak into expressions,
+                # so that they are resolved as in `{% for %}{% include_ %}`.
+                values.clear()
+                values[loopvar] = item
+
+                name = template_name.render(context)
+                template = templates.get(name)
+
+                if template is None:
+                    try:
+                        template = self.get_template(name, context)
+
+                    except TemplateDoesNotExist:
+                        if not fallback:
+                            raise
+
+                        template = self.resolve_template(fallback.resolve(context), context)
+
+                    # Each template is resolved only once per render.
+                    templates[name] = template
+
+                extra = {key: var.resolve(context) for key, var in extra_context}
+
+                target_values[loopvar] = item
+                target_values.update(extra)
+
+                if stream:
+                    yield from iter_template(template, target_context)
+
+                else:
+                    yield template.render(target_context)
 
 
 @register.tag('include_')
@@ -107,28 +418,39 @@ def include_(parser, token):
         {% load etc_misc %}
         {% include_ "sub_{{ postfix_var }}.html" fallback "default.html" %}
 
+    Batch mode renders a template for every item of an iterable in one go,
+    resolving every template only once:
+
+        {% include_ "row_{{ item.kind }}.html" for item in items fallback "row.html" %}
+
     """
     bits = token.split_contents()
 
     dynamic = False
+    loop = None
 
     # We fallback to built-in `include` if a template name contains no variables.
     if len(bits) >= 2:
-        dynamic = '{{' in bits[1]
+        dynamic = '{{' in bits[1] or 'for' in bits[2:]
 
         if dynamic:
             fallback = None
             bits_new = []
+            bits_iter = iter(bits)
 
-            for bit in bits:
-
-                if fallback is True:
-                    # This bit is a `fallback` argument.
-                    fallback = bit
-                    continue
+            for bit in bits_iter:
 
                 if bit == 'fallback':
-                    fallback = True
+                    # Next bit is a `fallback` argument.
+                    fallback = next(bits_iter, None)
+
+                elif bit == 'for' and loop is None:
+                    # Next bits are `<loopvar> in <items>`.
+                    loop = [next(bits_iter, None) for _ in range(3)]
+
+                    if loop[1] != 'in' or loop[2] is None:
+                        raise template.TemplateSyntaxError(
+                            '`include_` tag expects `for <var> in <items>` notation for batch rendering.')
 
                 else:
                     bits_new.append(bit)
@@ -142,12 +464,24 @@ def include_(parser, token):
     include_node = do_include(parser, token)
 
     if dynamic:
+        kwargs = {}
+        node_cls = DynamicIncludeNode
+
+        if loop:
+            node_cls = DynamicIncludeBatchNode
+            kwargs.update(loopvar=loop[0], items=parser.compile_filter(loop[2]))
+
+        if not isinstance(include_node.template.var, str):
+            raise template.TemplateSyntaxError(
+                '`include_` tag requires template name to be a string when dynamic or batch rendering is used.')
+
         # swap simple include with dynamic
-        include_node = DynamicIncludeNode(
+        include_node = node_cls(
             include_node.template,
             extra_context=include_node.extra_context,
             isolated_context=include_node.isolated_context,
             fallback=fallback or None,
+            **kwargs
         )
 
     return include_node
@@ -1,4 +1,5 @@
-import hashlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Union, Optional, Tuple
 
 try:
     from urllib.parse import urlencode
@@ -6,14 +7,71 @@ except ImportError:
     from urllib import urlencode
 
 from django import template
+from django.conf import settings
 from django.template.defaultfilters import safe
 from django.contrib.auth import get_user_model
+from django.db.models import QuerySet, Model
 
-USER_MODEL = get_user_model()
+from ..caches import BoundedCache
+from ..models import GravatarHashField
+
+URLS_CACHE = BoundedCache(size=getattr(settings, 'ETC_GRAVATAR_CACHE_SIZE', 1024))
+"""(email, size, default) to Gravatar URL mapping.
+See `hits` and `misses` attributes to tune cache size.
+
+"""
 
 register = template.Library()
 
 
+def __getattr__(name):
+    # User model is resolved lazily not to require apps registry on this module import.
+    if name == 'USER_MODEL':
+        return get_user_model()
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+@lru_cache(maxsize=32)
+def get_gravatar_query(size, default) -> str:
+    """Returns Gravatar URL query string for the given options.
+
+    :param int size:
+    :param str default:
+
+    """
+    return urlencode({'size': size, 'd': default})
+
+
+def make_gravatar_url(digest: str, size=65, default='identicon') -> str:
+    """Returns Gravatar URL for a given hash.
+
+    :param digest: Gravatar hash (see GravatarHashField.get_hash()).
+    :param int size:
+    :param str default:
+
+    """
+    return 'http://www.gravatar.com/avatar/%s/?%s' % (digest, get_gravatar_query(size, default))
+
+
+def get_stored_hash(obj) -> Optional[str]:
+    """Returns Gravatar hash stored in GravatarHashField of a given model instance if any.
+
+    :param obj:
+
+    """
+    if not isinstance(obj, Model):
+        return None
+
+    field_name = GravatarHashField.get_field_name(obj.__class__)
+
+    if field_name is None or field_name in obj.get_deferred_fields():
+        # Deferred field is not loaded not to issue a query for every object.
+        return None
+
+    return getattr(obj, field_name) or None
+
+
 def get_gravatar_url(obj, size=65, default='identicon'):
     """
 
@@ -24,14 +82,120 @@ def get_gravatar_url(obj, size=65, default='identicon'):
     :param str default: 404, mm (mystery-man), identicon, monsterid, wavatar, retro, blank
     :return:
     """
-    if isinstance(obj, USER_MODEL):
-        email = obj.email or obj.username
-    else:
+    digest = get_stored_hash(obj)
+
+    if digest:
+        return make_gravatar_url(digest, size=size, default=default)
+
+    if isinstance(obj, str):
         email = obj
+    else:
+        # Duck typing for user models and alike.
+        email = getattr(obj, 'email', None) or getattr(obj, 'username', None)
+
+    if not email:
+        return ''
+
+    # Normalized as Gravatar requires.
+    key = (email.strip().lower(), size, default)
+
+    url = URLS_CACHE.get(key)
+
+    if url is None:
+        url = make_gravatar_url(GravatarHashField.get_hash(key[0]), size=size, default=default)
+        URLS_CACHE.set(key, url)
+
+    return url
+
+
+def get_gravatar_urls(objects: Union[QuerySet, Iterable], size=65, default='identicon') -> Dict[Any, str]:
+    """Returns Gravatar URLs for a number of users or strings
+    as a dictionary indexed by user primary keys (or by strings).
+
+    For querysets only the required columns are fetched from DB.
+    Hashes stored in GravatarHashField are used if available.
+
+    Example:
+
+        urls = get_gravatar_urls(User.objects.filter(is_active=True))
+
+    :param objects: Users queryset or an iterable of users or strings.
+    :param int size:
+    :param str default:
+
+    """
+    if not isinstance(objects, QuerySet):
+        return {
+            (obj.pk if isinstance(obj, Model) else obj): get_gravatar_url(obj, size=size, default=default)
+            for obj in objects
+        }
+
+    model = objects.model
+    field_name = GravatarHashField.get_field_name(model)
+    source = get_source_fields(model)
+
+    if field_name is None:
+        return {
+            key: get_gravatar_url(next(filter(None, values), ''), size=size, default=default)
+            for key, *values in objects.values_list('pk', *source)
+        }
+
+    return {
+        key: (
+            make_gravatar_url(digest, size=size, default=default) if digest else
+            get_gravatar_url(next(filter(None, values), ''), size=size, default=default)
+        )
+        for key, digest, *values in objects.values_list('pk', field_name, *source)
+    }
+
+
+@lru_cache(maxsize=None)
+def get_source_fields(model) -> Tuple[str, ...]:
+    """Returns names of model fields to get a value to hash from
+    (e.g. email and username), the first non-empty value is used.
+
+    Hash field `source` is respected, for user models email and username fields are used.
+
+    :param model:
+
+    """
+    field_name = GravatarHashField.get_field_name(model)
+
+    if field_name is None:
+        get_email_field_name = getattr(model, 'get_email_field_name', None)
+
+        source = (
+            get_email_field_name() if get_email_field_name else 'email',
+            getattr(model, 'USERNAME_FIELD', 'username'),
+        )
+
+    else:
+        source = model._meta.get_field(field_name).source
+
+    concrete = {field.name for field in model._meta.concrete_fields}
+
+    return tuple(name for name in dict.fromkeys(source) if name in concrete)
+
+
+@register.simple_tag
+def gravatar_annotate(objects, size=65, default='identicon'):
+    """Sets Gravatar image URL into `gravatar_url` attribute
+    of every UserModel in a given list in one pass.
+
+    Example:
+
+        {% load gravatar %}
+        {% gravatar_annotate users %}
+        {% for user in users %}{{ user.gravatar_url }}{% endfor %}
+
+    :param objects:
+    :param int size:
+    :param str default:
+    :return:
+    """
+    for obj in objects:
+        obj.gravatar_url = get_gravatar_url(obj, size=size, default=default)
 
-    if email:
-        return ('http://www.gravatar.com/avatar/%s/?%s' %
-                (hashlib.md5(email.encode()).hexdigest(), urlencode({'size': size, 'd': default})))
     return ''
 
 
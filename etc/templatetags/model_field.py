@@ -1,11 +1,18 @@
+from functools import lru_cache
+from typing import Tuple, Sequence
+
 from django import template
 from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist
-from django.core.paginator import Page
-from django.db.models.query import QuerySet
+
+from ..caches import BoundedCache
+from ..meta import FieldTexts, get_model, get_model_meta
 
 register = template.Library()
 
+FIELDS_META_CACHE = BoundedCache(size=256)
+"""(model class, language, fields names, attributes names) to fields metadata mapping."""
+
 
 @register.tag
 def model_field_verbose_name(parser, token):
@@ -45,6 +52,52 @@ def model_field_help_text(parser, token):
     return _get_model_field_attr('model_field_help_text', 'help_text', token)
 
 
+@register.tag
+def model_fields_meta(parser, token):
+    """Puts metadata for a number of model fields into a template context variable
+    at once. Handy for table headers.
+
+        {% model_fields_meta from mymodel fields "a,b,c" attrs "verbose_name,help_text" as cols %}
+        {% for col in cols %}<th title="{{ col.help_text }}">{{ col.verbose_name }}</th>{% endfor %}
+
+    `fields` and `attrs` are optional (all fields; verbose name and help text by default)
+    and can be template variables containing either comma-separated strings or lists.
+
+    Every item in the list has `name` attribute and attributes requested.
+
+    """
+    tokens = token.split_contents()
+    tag_name = tokens.pop(0)
+
+    error = template.TemplateSyntaxError(
+        '`%(tag_name)s` tag requires the following notation: '
+        '{%% %(tag_name)s from model [fields "a,b"] [attrs "verbose_name,help_text"] as myvar %%}.'
+        % {'tag_name': tag_name}
+    )
+
+    if len(tokens) < 4 or tokens[0] != 'from' or tokens[-2] != 'as' or len(tokens) % 2:
+        raise error
+
+    model = tokens[1]
+    as_var = tokens[-1]
+
+    options = {'fields': None, 'attrs': None}
+
+    for option, value in zip(tokens[2:-2:2], tokens[3:-2:2]):
+        if option not in options or options[option] is not None:
+            raise error
+
+        options[option] = parser.compile_filter(value)
+
+    return FieldsMetaNode(
+        model=model,
+        fields=options['fields'],
+        attrs=options['attrs'],
+        tag_name=tag_name,
+        as_var=as_var,
+    )
+
+
 def _get_model_field_attr(tag_name, attr_name, token):
     tokens = token.split_contents()
     tokens_num = len(tokens)
@@ -66,6 +119,152 @@ def _get_model_field_attr(tag_name, attr_name, token):
     return FieldAttrNode(field, attr_name, tag_name, as_var)
 
 
+@lru_cache(maxsize=None)
+def get_fields_names(model) -> Tuple[str, ...]:
+    """Returns model fields names. Results are cached per model class.
+
+    :param model: Model class.
+
+    """
+    fields_name_map = getattr(model._meta, '_name_map', None)
+
+    if fields_name_map is None:
+        return tuple(f.attname for f in model._meta.fields)
+
+    return tuple(fields_name_map.keys())
+
+
+class FieldMeta:
+    """Model field metadata. See `model_fields_meta` tag."""
+
+    __slots__ = ['name', 'attrs']
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __getattr__(self, name):
+        if name == 'attrs':
+            # Not set yet, e.g. on copying or unpickling.
+            raise AttributeError(name)
+
+        try:
+            return self.attrs[name]
+
+        except KeyError:
+            raise AttributeError(name)
+
+    def __repr__(self):
+        return f'<FieldMeta: {self.name}>'
+
+
+def get_fields_meta(model, fields_names: Sequence[str] = None, attrs_names: Sequence[str] = None) -> Tuple[FieldMeta, ...]:
+    """Returns metadata for model fields. Results are cached.
+    Verbose names and help texts are evaluated for the currently active language (see `get_model_meta()`).
+    Raises FieldDoesNotExist.
+
+    :param model: Model class.
+    :param fields_names: Fields names. None - all fields.
+    :param attrs_names: Fields attributes names. None - verbose name and help text.
+
+    """
+    fields_names = tuple(fields_names or (field.name for field in model._meta.fields))
+    attrs_names = tuple(attrs_names or ('verbose_name', 'help_text'))
+
+    model_meta = get_model_meta(model)
+
+    key = (model, model_meta.language, fields_names, attrs_names)
+
+    fields_meta = FIELDS_META_CACHE.get(key)
+
+    if fields_meta is None:
+        get_field = model._meta.get_field
+        texts_all = model_meta.fields
+        fields_meta = []
+
+        for field_name in fields_names:
+            try:
+                field = get_field(field_name)
+
+            except FieldDoesNotExist:
+                raise FieldDoesNotExist(field_name)
+
+            # Texts are taken from the registry, the rest is from the field itself.
+            texts = texts_all.get(field_name)
+
+            fields_meta.append(FieldMeta(
+                field_name,
+                {
+                    attr_name: getattr(
+                        texts if texts is not None and attr_name in FieldTexts.__slots__ else field,
+                        attr_name, ''
+                    )
+                    for attr_name in attrs_names
+                }
+            ))
+
+        fields_meta = tuple(fields_meta)
+        FIELDS_META_CACHE.set(key, fields_meta)
+
+    return fields_meta
+
+
+def split_names(value) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        value = value.split(',')
+
+    return tuple(name.strip() for name in value if name.strip())
+
+
+class FieldsMetaNode(template.Node):
+
+    def __init__(self, model, fields, attrs, tag_name, as_var):
+        self.tag_name = tag_name
+        self.var_model = template.Variable(model)
+        self.fields = fields
+        self.attrs = attrs
+        self.as_var = as_var
+
+    def render(self, context):
+        tag_name = self.tag_name
+        var_model = self.var_model
+
+        try:
+            model = get_model(var_model.resolve(context))
+
+        except template.VariableDoesNotExist:
+            if settings.DEBUG:
+                raise template.TemplateSyntaxError(
+                    '`%s` template tag error: `%s` model is not found in context.' % (tag_name, var_model)
+                )
+            context[self.as_var] = []
+            return ''
+
+        fields = self.fields
+        attrs = self.attrs
+
+        fields = split_names(fields.resolve(context)) if fields else None
+        attrs = split_names(attrs.resolve(context)) if attrs else None
+
+        try:
+            fields_meta = get_fields_meta(model, fields, attrs)
+
+        except FieldDoesNotExist as e:
+            fields_meta = []
+            if settings.DEBUG:
+                raise template.TemplateSyntaxError(
+                    '`%s` template tag error: `%s` field is not found in `%s` model. '
+                    'Possible choices: %s.' % (
+                        tag_name,
+                        e,
+                        model.__name__,
+                        ', '.join(get_fields_names(model))))
+
+        context[self.as_var] = fields_meta
+
+        return ''
+
+
 class FieldAttrNode(template.Node):
 
     def __init__(self, field, attr_name, tag_name, as_var=None):
@@ -74,6 +273,20 @@ class FieldAttrNode(template.Node):
         self.attr_name = attr_name
         self.as_var = as_var
 
+        # Variables are compiled only once.
+        lookups = template.Variable(field).lookups
+        self.var_model = template.Variable(lookups[0])
+
+        field_name = None
+        var_field_name = None
+
+        if len(lookups) > 1:
+            field_name = lookups[1]
+            var_field_name = template.Variable(field_name)
+
+        self.field_name = field_name
+        self.var_field_name = var_field_name
+
     def render(self, context):
         as_var = self.as_var
 
@@ -84,15 +297,9 @@ class FieldAttrNode(template.Node):
                 return ''
             return contents
 
-        def get_field(model, field_name):
-            return model._meta.get_field(field_name)
-
-        var_field = template.Variable(self.field)
-        var_model = var_field.lookups[0]
+        field_name = self.field_name
 
-        try:
-            field_name = var_field.lookups[1]
-        except IndexError:
+        if field_name is None:
             if settings.DEBUG:
                 raise template.TemplateSyntaxError(
                     '`%s` template tag requires model.field notation but `%s` is given.' %
@@ -100,8 +307,10 @@ class FieldAttrNode(template.Node):
                 )
             return return_contents('')
 
+        var_model = self.var_model
+
         try:
-            model = template.Variable(var_model).resolve(context)
+            model = var_model.resolve(context)
         except template.VariableDoesNotExist:
             if settings.DEBUG:
                 raise template.TemplateSyntaxError(
@@ -110,31 +319,23 @@ class FieldAttrNode(template.Node):
                 )
             return return_contents('')
 
-        # Allow operations on homogeneous sets -- Pages and Query Sets.
-        if isinstance(model, Page):
-            model = model.object_list
-
-        if isinstance(model, QuerySet):
-            model = model.model
+        model = get_model(model)
 
-        fields_name_map = getattr(model._meta, '_name_map', None)
-        if fields_name_map is None:
-            fields_name_map = {f.attname: (f,) for f in model._meta.fields}
+        fields = get_model_meta(model).fields
 
         try:
 
-            try:
-                # case #1: field name is literal
-                model_field = get_field(model, field_name)
+            # case #1: field name is literal
+            field = fields.get(field_name)
 
-            except FieldDoesNotExist:
+            if field is None:
                 # case #1: field name is a variable
-                field_name = template.Variable(field_name).resolve(context)
-                model_field = get_field(model, field_name)
+                field_name = self.var_field_name.resolve(context)
+                field = fields[field_name]
 
-            contents = getattr(model_field, self.attr_name)
+            contents = getattr(field, self.attr_name)
 
-        except (FieldDoesNotExist, template.VariableDoesNotExist):
+        except (KeyError, TypeError, template.VariableDoesNotExist):
             contents = ''
             if settings.DEBUG:
                 raise template.TemplateSyntaxError(
@@ -142,7 +343,7 @@ class FieldAttrNode(template.Node):
                     'Possible choices: %s.' % (
                         self.tag_name,
                         field_name,
-                        model.__class__.__name__,
-                        ', '.join(fields_name_map.keys())))
+                        model.__name__,
+                        ', '.join(get_fields_names(model))))
 
         return return_contents(contents)
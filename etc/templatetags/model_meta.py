@@ -1,5 +1,7 @@
 from django import template
 
+from ..meta import get_model_meta
+
 register = template.Library()
 
 
@@ -14,7 +16,7 @@ def model_meta_verbose_name(model):
 
     :param Model model:
     """
-    return model._meta.verbose_name
+    return get_model_meta(model).verbose_name
 
 
 @register.simple_tag
@@ -29,4 +31,4 @@ def model_meta_verbose_name_plural(model):
     :param Model model:
     :return:
     """
-    return model._meta.verbose_name_plural
+    return get_model_meta(model).verbose_name_plural
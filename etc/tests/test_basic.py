@@ -1,3 +1,5 @@
+import pickle
+from copy import copy, deepcopy
 from os import environ
 from sys import version_info
 
@@ -5,6 +7,8 @@ import pytest
 from django import forms
 from django.contrib.auth.models import User
 from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateDoesNotExist
+from django.test import override_settings
 from django.template.base import TemplateSyntaxError
 
 from etc.templatetags.gravatar import gravatar_get_url, gravatar_get_img
@@ -103,6 +107,136 @@ class TestModelFieldTemplateTags:
         check('model_field_verbose_name', 'first name', 'model.first_name')
         check('model_field_help_text', 'whether the user can log', 'model.is_staff')
 
+    def test_cache(self, template_render_tag, template_context):
+        from django.utils.translation import override
+        from etc.meta import MODELS_META, get_model_meta, reset_models_meta
+
+        MODELS_META.clear()
+
+        context = template_context({'model': User(), 'models': User.objects.all(), 'field': 'last_name'})
+        result = template_render_tag(
+            'model_field',
+            'model_field_verbose_name from model.first_name %}{% model_field_verbose_name from models.first_name %}'
+            '{% model_field_verbose_name from model.field', context)
+
+        assert result == 'first namefirst namelast name'
+        assert len(MODELS_META) == 1
+
+        meta = get_model_meta(User)
+        assert meta is get_model_meta(User.objects.all())
+        assert meta.fields['first_name'].verbose_name == 'first name'
+        assert meta.verbose_name_plural == 'users'
+
+        # Translation activation.
+        with override('ru'):
+            meta_ru = get_model_meta(User)
+            assert meta_ru is not meta
+            assert meta_ru.fields['first_name'].verbose_name == 'имя'
+            assert model_meta_verbose_name(User) == 'пользователь'
+
+        assert len(MODELS_META) == 2
+        assert get_model_meta(User) is meta
+
+        reset_models_meta(setting='DEBUG')
+        assert len(MODELS_META) == 2
+
+        reset_models_meta(setting='LANGUAGE_CODE')
+        assert len(MODELS_META) == 0
+
+    def test_fields_meta(self, template_render_tag, template_context):
+        from etc.templatetags.model_field import FIELDS_META_CACHE
+
+        FIELDS_META_CACHE.clear()
+
+        context = template_context({'users': User.objects.all(), 'names': ['username', 'is_staff']})
+
+        result = template_render_tag(
+            'model_field',
+            'model_fields_meta from users fields "first_name, is_staff" attrs "verbose_name,help_text" as cols %}'
+            '{% for col in cols %}{{ col.name }}:{{ col.verbose_name }};{% endfor', context)
+
+        assert result == 'first_name:first name;is_staff:staff status;'
+        assert context['cols'][1].help_text.startswith('Designates whether')
+
+        # Texts are evaluated for the active language, not forced on every render.
+        assert type(context['cols'][0].verbose_name) is str
+
+        from django.utils.translation import override
+
+        with override('ru'):
+            template_render_tag('model_field', 'model_fields_meta from users fields "first_name" as cols', context)
+            assert context['cols'][0].verbose_name == 'имя'
+
+        # Cached.
+        template_render_tag(
+            'model_field', 'model_fields_meta from users fields "first_name,is_staff" as cols', context)
+        assert FIELDS_META_CACHE.hits == 1
+
+        # Variables and defaults.
+        template_render_tag('model_field', 'model_fields_meta from users fields names as cols', context)
+        assert [col.name for col in context['cols']] == ['username', 'is_staff']
+
+        template_render_tag('model_field', 'model_fields_meta from users as cols', context)
+        assert [col.name for col in context['cols']] == [field.name for field in User._meta.fields]
+
+        with pytest.raises(AttributeError):
+            context['cols'][0].unknown
+
+        from django.contrib.auth.models import Permission
+        from etc.templatetags.model_field import get_fields_meta
+
+        assert 'content_type' in [col.name for col in get_fields_meta(Permission)]
+
+        col = context['cols'][1]
+        assert copy(col).verbose_name == col.verbose_name
+        assert pickle.loads(pickle.dumps(col)).attrs == col.attrs
+
+        # Errors.
+        with pytest.raises(TemplateSyntaxError):
+            template_render_tag('model_field', 'model_fields_meta from users fields "a" fields "b" as cols')
+
+        with pytest.raises(TemplateSyntaxError):
+            template_render_tag('model_field', 'model_fields_meta users as cols')
+
+        template_render_tag('model_field', 'model_fields_meta from users fields "unknown" as cols', context)
+        assert context['cols'] == []
+
+        with override_settings(DEBUG=True):
+            with pytest.raises(TemplateSyntaxError) as e:
+                template_render_tag('model_field', 'model_fields_meta from users fields "unknown" as cols', context)
+
+            assert '`unknown` field' in f'{e.value}'
+
+            with pytest.raises(TemplateSyntaxError):
+                template_render_tag('model_field', 'model_fields_meta from nothere as cols')
+
+    def test_wide_header(self, monkeypatch, template_render_tag, template_context):
+        from etc.templatetags import model_field
+        from etc.tests.testapp.models import MyWideModel
+
+        def fail(model):  # pragma: nocover
+            raise AssertionError('Fields names map is built on success path')
+
+        monkeypatch.setattr(model_field, 'get_fields_names', fail)
+
+        names = [f'field_{idx}' for idx in range(300)]
+        context = template_context({'model': MyWideModel, 'names': names})
+
+        # A header for a model with hundreds of fields.
+        result = template_render_tag(
+            'model_field',
+            'for name in names %}{% model_field_verbose_name from model.name %},{% endfor', context)
+
+        assert result == ''.join(f'Field {idx},' for idx in range(300))
+
+        monkeypatch.undo()
+
+        with override_settings(DEBUG=True):
+            with pytest.raises(TemplateSyntaxError) as e:
+                template_render_tag('model_field', 'model_field_verbose_name from model.unknown', context)
+
+        assert 'field_299' in f'{e.value}'
+
 
 class TestForm:
 
@@ -119,6 +253,52 @@ class TestForm:
         assert output.count('data-a') == 2
         assert output.count('clickable') == 2
 
+    def test_widgets_attrs(self):
+        from etc.toolbox import WidgetsAttrs
+
+        attrs = WidgetsAttrs({'data-a': lambda field: field.label, 'class': 'clickable'})
+        assert not attrs.shared
+
+        f = MyForm()
+        attrs.apply(f)
+
+        widget1, widget2 = [field.widget for field in f.fields.values()]
+        assert widget1.attrs == {'data-a': 'f1', 'class': 'clickable'}
+        assert list(widget1.attrs) == ['data-a', 'class']
+        assert widget2.attrs['data-a'] == 'f2'
+
+        # Sharing.
+        attrs = WidgetsAttrs({'class': 'clickable'}, share=True)
+        assert attrs.shared
+
+        set_form_widgets_attrs(f, attrs)
+        assert widget1.attrs is widget2.attrs is attrs.template
+
+    def test_widgets_attrs_formset(self):
+        from etc.toolbox import WidgetsAttrs
+
+        WideForm = type('WideForm', (forms.Form,), {
+            f'field_{idx}': forms.CharField(label=f'f{idx}') for idx in range(30)})
+
+        formset = forms.formset_factory(WideForm, extra=200)()
+
+        calls = []
+
+        def get_label(field):
+            calls.append(field)
+            return field.label
+
+        attrs = WidgetsAttrs({'class': 'clickable', 'data-a': get_label})
+
+        # A large formset: callables are the only per-field work.
+        set_form_widgets_attrs(formset, attrs)
+
+        assert len(formset.forms) == 200
+        assert len(calls) == 200 * 30
+        widget = formset.forms[-1].fields['field_29'].widget
+        assert widget.attrs == {'class': 'clickable', 'data-a': 'f29'}
+        assert 'class="clickable"' in f'{formset.forms[0]["field_0"]}'
+
 
 class TestGravatarTemplateTags:
 
@@ -142,6 +322,123 @@ class TestGravatarTemplateTags:
 
         assert gravatar_get_url(None) == ''
 
+        class Person:
+            email = 'idle@sign.som'
+
+        assert gravatar_get_url(Person(), 101, 'retro') == url
+
+        from etc.templatetags import gravatar
+        assert gravatar.USER_MODEL is User
+
+    def test_cache(self):
+        from etc.templatetags.gravatar import URLS_CACHE
+
+        URLS_CACHE.clear()
+        hits, misses = URLS_CACHE.hits, URLS_CACHE.misses
+
+        url = gravatar_get_url(' Idle@sign.som', 101, 'retro')
+        assert 'http://www.gravatar.com/avatar/37e24208b31f2a8f1e0f84d4c93fdfb0/' in url
+        assert URLS_CACHE.misses == misses + 1
+
+        assert gravatar_get_url('idle@sign.som', 101, 'retro') == url
+        assert URLS_CACHE.hits == hits + 1
+
+        assert gravatar_get_url('idle@sign.som', 100, 'retro') != url
+        assert len(URLS_CACHE) == 2
+
+    def test_bulk(self, template_render_tag, template_context):
+        from etc.templatetags.gravatar import get_gravatar_urls
+
+        user_1 = User.objects.create(username='idle')
+        user_2 = User.objects.create(username='other', email='idle@sign.som')
+
+        urls = get_gravatar_urls(User.objects.all(), 101, 'retro')
+        assert len(urls) == 2
+        assert 'ec2f993aec2c27fc750119ab17b16cdb/' in urls[user_1.pk]
+        assert '37e24208b31f2a8f1e0f84d4c93fdfb0/' in urls[user_2.pk]
+        assert 'retro' in urls[user_1.pk]
+
+        assert get_gravatar_urls([user_1, 'idle@sign.som', '']) == {
+            user_1.pk: gravatar_get_url(user_1),
+            'idle@sign.som': gravatar_get_url('idle@sign.som'),
+            '': '',
+        }
+
+        # No `username` or `email` columns.
+        from etc.tests.testapp.models import MyEmailUser
+
+        user_3 = MyEmailUser.objects.create(contact='idle@sign.som')
+        assert get_gravatar_urls(MyEmailUser.objects.all(), 101, 'retro') == {user_3.pk: urls[user_2.pk]}
+
+        users = list(User.objects.all())
+        result = template_render_tag('gravatar', 'gravatar_annotate users 101', template_context({'users': users}))
+        assert result == ''
+        assert users[0].gravatar_url == gravatar_get_url(users[0], 101)
+
+    def test_stored_hash(self, command_run):
+        from etc.templatetags.gravatar import get_gravatar_urls
+        from etc.tests.testapp.models import MyGravatarUser
+
+        user_1 = MyGravatarUser.objects.create(username='idle')
+        assert user_1.gravatar_hash == 'ec2f993aec2c27fc750119ab17b16cdb'
+
+        user_2 = MyGravatarUser.objects.create(username='other', email='idle@sign.som')
+        assert user_2.gravatar_hash == '37e24208b31f2a8f1e0f84d4c93fdfb0'
+
+        # Emulate objects existing before the hash field is introduced.
+        MyGravatarUser.objects.update(gravatar_hash='')
+        MyGravatarUser.objects.filter(pk=user_1.pk).update(gravatar_hash='stored')
+
+        urls = get_gravatar_urls(MyGravatarUser.objects.all())
+        assert 'avatar/stored/' in urls[user_1.pk]
+        assert '37e24208b31f2a8f1e0f84d4c93fdfb0/' in urls[user_2.pk]
+
+        result = command_run('gravatar_hashes', options={'model': 'testapp.MyGravatarUser', 'batch_size': 1})
+        assert 'updated: 1' in result
+
+        user_2.refresh_from_db()
+        assert user_2.gravatar_hash == '37e24208b31f2a8f1e0f84d4c93fdfb0'
+
+        user_1.refresh_from_db()
+        assert 'avatar/stored/' in gravatar_get_url(user_1)
+
+        result = command_run('gravatar_hashes', options={'model': 'testapp.MyGravatarUser', 'all': True})
+        assert 'updated: 1' in result
+
+        user_1.refresh_from_db()
+        assert user_1.gravatar_hash == 'ec2f993aec2c27fc750119ab17b16cdb'
+
+        with pytest.raises(Exception):
+            command_run('gravatar_hashes')  # No hash field in User model.
+
+    def test_stored_hash_deferred(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from etc.tests.testapp.models import MyGravatarUser
+
+        MyGravatarUser.objects.create(username='other', email='idle@sign.som')
+        MyGravatarUser.objects.update(gravatar_hash='stored')
+
+        user = MyGravatarUser.objects.only('email').get()
+
+        with CaptureQueriesContext(connection) as queries:
+            url = gravatar_get_url(user)
+
+        assert not queries.captured_queries
+        assert '37e24208b31f2a8f1e0f84d4c93fdfb0/' in url
+
+    def test_hashes_command_property_source(self, command_run):
+        from etc.tests.testapp.models import MyPropertyGravatarUser
+
+        user = MyPropertyGravatarUser.objects.create(nick='idle')
+        MyPropertyGravatarUser.objects.update(gravatar_hash='')
+
+        result = command_run('gravatar_hashes', options={'model': 'testapp.MyPropertyGravatarUser'})
+        assert 'updated: 1' in result
+
+        user.refresh_from_db()
+        assert user.gravatar_hash == '37e24208b31f2a8f1e0f84d4c93fdfb0'
+
     def test_verbose_get_img(self):
         u = User(username='idle')
         url = gravatar_get_img(u, 101, 'retro')
@@ -183,6 +480,18 @@ class TestChoices:
         assert Role.get_hint(Role(0)) == 'Description'
         assert Role.get_hint(Role.APPLICANT) == 'Description'
 
+        assert Role.get_titles([2, Role.ADMIN, 0]) == ['Member', 'Administrator', 'Applicant']
+        assert Role.get_hints((0, Role.MEMBER)) == ['Description', '']
+        assert Role.get_value('Administrator') == 1
+
+        choices = Role.get_choices()
+        assert choices == ((0, 'Applicant'), (1, 'Administrator'), (2, 'Member'))
+        assert get_choices(Role) is choices
+        assert Variant.get_choices() == (('a', 'A'), ('b', 'B'))
+
+        with pytest.raises(KeyError):
+            Role.get_title(5)
+
         objects = MyChoiceModel.objects
 
         obj_1 = objects.create()
@@ -194,6 +503,122 @@ class TestChoices:
         assert obj_1.id == objects.get(role=Role.MEMBER).id
         assert obj_2.id == objects.get(variant=Variant.B).id
 
+    def test_lazy_titles(self):
+        import subprocess
+        import sys
+        from enum import Enum
+        from types import MappingProxyType
+        from django.utils.translation import gettext_lazy, override
+        from etc.toolbox import ChoicesEnumMixin
+
+        script = (
+            'from enum import Enum;'
+            'from django.conf import settings; settings.configure();'
+            'from django.utils.translation import gettext_lazy;'
+            'from etc.toolbox import ChoicesEnumMixin;'
+            'Answer = Enum("Answer", [("YES", (1, gettext_lazy("Yes"))), ("NO", (0, gettext_lazy("No")))],'
+            ' type=ChoicesEnumMixin);'
+            'print(len(Answer))'
+        )
+        # No apps registry is required: titles are not forced on enum creation.
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            capture_output=True, text=True, env={**environ, 'PYTHONPATH': ':'.join(sys.path)})
+        assert result.stdout.strip() == '2', result.stderr
+
+        class Answer(ChoicesEnumMixin, Enum):
+
+            YES = 1, gettext_lazy('Yes')
+            NO = 0, gettext_lazy('No')
+
+        assert Answer.get_value('Yes') == 1
+
+        with override('ru'):
+            assert Answer.get_value('Да') == 1
+            assert Answer.get_title(Answer.NO) == 'Нет'
+
+            with pytest.raises(KeyError):
+                Answer.get_value('Yes')
+
+        lookup = Answer._get_lookup('_titles_lookup')
+        assert isinstance(lookup, MappingProxyType)
+        assert lookup is Answer._get_lookup('_titles_lookup')
+
+        with pytest.raises(TypeError):
+            lookup[2] = 'Maybe'
+
+    def test_display(self, monkeypatch):
+        from etc.tests.testapp.models import Role, MyChoiceModel
+        from etc.toolbox import choices_display
+
+        objects = MyChoiceModel.objects
+        objects.bulk_create([MyChoiceModel(role=role) for role in list(Role) * 100])
+
+        calls = []
+        get_title = Role.get_title.__func__
+
+        def get_title_(cls, item):
+            calls.append(item)
+            return get_title(cls, item)
+
+        monkeypatch.setattr(Role, 'get_title', classmethod(get_title_))
+
+        # Benchmark: DB-side titles against per-row titles mapping in Python.
+        # Work done in Python is compared, since timings are unstable for in-memory DB.
+        titles_py = [Role.get_title(role) for role in objects.order_by('id').values_list('role', flat=True)]
+        calls_py = len(calls)
+
+        calls.clear()
+        titles_db = list(
+            objects.order_by('id').annotate(title=choices_display('role', Role)).values_list('title', flat=True))
+        calls_db = len(calls)
+
+        assert titles_db == titles_py
+        assert calls_py == 300
+        assert calls_db == 0
+        # DB-side work depends on choices number, not on rows number.
+        assert len(choices_display('role', Role).cases) == len(Role)
+        assert titles_db[:3] == ['Applicant', 'Administrator', 'Member']
+
+        types = choices_list((0, 'Zero'), (2, 'Two'))
+        titles = list(
+            objects.order_by('id').annotate(title=choices_display('role', types, default='-')
+        ).values_list('title', flat=True))
+        assert titles[:3] == ['Zero', '-', 'Two']
+
+    def test_translated(self):
+        from django.utils.functional import lazy
+        from django.utils.translation import override, get_language
+        from etc.choices import TRANSLATED_CACHE
+        from etc.toolbox import get_choices_translated
+
+        calls = []
+
+        def translate(title):
+            calls.append(title)
+            return f'{title}-{get_language()}'
+
+        translate_lazy = lazy(translate, str)
+
+        types = choices_list((1, translate_lazy('one')), (2, translate_lazy('two')))
+
+        with override('en'):
+            assert get_choices_translated(types) == ((1, 'one-en'), (2, 'two-en'))
+            assert get_choices_translated(types) == ((1, 'one-en'), (2, 'two-en'))
+            assert len(calls) == 2
+
+        with override('de'):
+            assert get_choices_translated(types) == ((1, 'one-de'), (2, 'two-de'))
+            assert len(calls) == 4
+
+        with override_settings(LANGUAGE_CODE='en'):
+            assert not len(TRANSLATED_CACHE)
+
+        # Not cached.
+        get_choices_translated({1: translate_lazy('one')})
+        get_choices_translated({1: translate_lazy('one')})
+        assert len(calls) == 6
+
     def test_choices(self):
 
         types_dict = choices_list(
@@ -216,6 +641,56 @@ class TestChoices:
         assert ch[1][0] == 2
         assert ch[1][1] == 'T2'
 
+        assert get_choices(types_dict) is ch
+        assert get_choices({1: 'T1'}) == ((1, 'T1'),)
+
+        with pytest.raises(TypeError):
+            types_dict[3] = 'T3'
+
+        with pytest.raises(TypeError):
+            types_dict.update({3: 'T3'})
+
+        assert deepcopy(types_dict) == types_dict
+        assert pickle.loads(pickle.dumps(types_dict)).get_choices() == ch
+
+
+class TestBoundedCache:
+
+    def test_basic(self):
+        from etc.caches import BoundedCache
+
+        cache = BoundedCache(size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        assert cache.get('x') is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+        cache.set('c', 3)  # `b` is the least recently used
+        assert 'b' not in cache
+        assert cache.get('b', 'no') == 'no'
+        assert len(cache) == 2
+
+        cache.clear()
+        assert not len(cache)
+
+        cache = BoundedCache(size=0)
+        cache.set('a', 1)
+        assert cache.get('a') is None
+
+    def test_ttl(self):
+        from etc.caches import BoundedCache
+
+        cache = BoundedCache(size=2, ttl=0)
+        cache.set('a', 1)
+        assert cache.get('a') is None
+        assert 'a' not in cache
+
+        cache = BoundedCache(size=2, ttl=100)
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+
 
 class TestGetModelClass:
 
@@ -278,6 +753,137 @@ class TestGetSiteUrl:
 
         assert get_site_url(request=FakeRequest) == 'xyz://example.com'
 
+    def test_cache(self):
+        from etc.sites import SETTINGS_CACHE, reset_site_url_cache
+
+        reset_site_url_cache()
+        assert get_site_url() == 'http://example.com'
+        assert len(SETTINGS_CACHE) == 1
+
+        assert get_site_url() == 'http://example.com'
+        assert len(SETTINGS_CACHE) == 1
+
+        with override_settings(SITE_DOMAIN='some.loc'):
+            assert not len(SETTINGS_CACHE)
+            assert get_site_url() == 'http://some.loc'
+
+        assert get_site_url() == 'http://example.com'
+
+        with override_settings(DEBUG=True):  # unrelated settings do not reset cache
+            assert len(SETTINGS_CACHE) == 1
+
+    def test_hosts_cache(self):
+        from django.contrib.sites.models import Site
+        from etc.sites import HOSTS_CACHE, reset_site_url_cache
+
+        class FakeRequest:
+
+            scheme = 'https'
+
+            @classmethod
+            def get_host(cls):
+                return 'example.com'
+
+        reset_site_url_cache()
+
+        with override_settings(SITE_ID=None):
+            assert get_site_url(request=FakeRequest) == 'https://example.com'
+            assert HOSTS_CACHE.get('example.com') == 'example.com'
+
+            # Other models changes are ignored.
+            User.objects.create(username='other')
+            assert HOSTS_CACHE.get('example.com') == 'example.com'
+
+            site = Site.objects.get(domain='example.com')
+            site.name = 'other'
+            site.save()
+            assert not len(HOSTS_CACHE)
+
+        assert not len(HOSTS_CACHE)
+        assert get_site_url(request=FakeRequest) == 'https://example.com'
+        assert HOSTS_CACHE.get(None) == 'example.com'
+
+    def test_no_sites_contrib(self):
+        import subprocess
+        import sys
+
+        script = (
+            'import django;'
+            'from django.conf import settings;'
+            'settings.configure(INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth", "etc"]);'
+            'django.setup();'
+            'import etc.toolbox, etc.templatetags.etc_misc;'
+            'from django.core.management import call_command;'
+            'call_command("check")'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            capture_output=True, text=True, env={**environ, 'PYTHONPATH': ':'.join(sys.path)})
+
+        assert result.returncode == 0, result.stderr
+        assert 'no issues' in result.stdout
+
+    def test_async(self):
+        from asyncio import run
+        from django.contrib.sites.shortcuts import get_current_site
+        from etc.sites import reset_site_url_cache
+        from etc.toolbox import aget_site_url
+
+        class FakeRequest:
+
+            scheme = 'https'
+
+            @classmethod
+            def get_host(cls):
+                return 'example.com:8000'
+
+        get_current_site(None)  # Warm up Sites contrib cache to not to query DB from another thread.
+        reset_site_url_cache()
+
+        assert run(aget_site_url()) == 'http://example.com'
+        assert run(aget_site_url(FakeRequest)) == 'https://example.com'
+
+        with override_settings(SITE_DOMAIN='some.loc'):
+            assert run(aget_site_url()) == 'http://some.loc'
+
+        with override_settings(SITE_ID=None):
+            get_current_site(FakeRequest)
+            assert run(aget_site_url(FakeRequest)) == 'https://example.com'
+
+            # The same as synchronous version.
+            with pytest.raises(Exception) as e_sync:
+                get_site_url()
+
+            with pytest.raises(e_sync.type):
+                run(aget_site_url())
+
+    def test_absolute_urls(self):
+        from etc.toolbox import get_absolute_url, iter_absolute_urls
+
+        class Obj:
+
+            def get_absolute_url(self):
+                return '/obj/'
+
+        assert get_absolute_url('/a/') == 'http://example.com/a/'
+        assert get_absolute_url('a/', base='https://other.loc') == 'https://other.loc/a/'
+        assert get_absolute_url('ftp://other.loc/a/') == 'ftp://other.loc/a/'
+        assert get_absolute_url('//other.loc/a/') == '//other.loc/a/'
+        assert get_absolute_url('/login/?next=http://ex.com/a/') == 'http://example.com/login/?next=http://ex.com/a/'
+
+        urls = iter_absolute_urls(['/a/', 'b', Obj()])
+        assert list(urls) == ['http://example.com/a/', 'http://example.com/b', 'http://example.com/obj/']
+
+        from django.template import Context, Template
+
+        result = Template('{% load etc_misc %}{{ path|site_url }}|{{ bogus|site_url }}').render(Context({'path': '/a/'}))
+        assert result == 'http://example.com/a/|'
+
+        result = Template(
+            '{% load etc_misc %}{% site_url as base %}{{ path|site_url:base }}|{{ path|site_url:"https://other.loc" }}'
+        ).render(Context({'path': '/a/'}))
+        assert result == 'http://example.com/a/|https://other.loc/a/'
+
     def test_tempalte_tag(self, template_render_tag):
         url = 'http://pythonz.net'
 
@@ -307,7 +913,240 @@ class TestImportModules:
         assert len(m) == 1
         assert hasattr(m[0], 'get_site_url')
 
+    def test_lazy(self):
+        from etc.tests import testapp
+
+        m = import_project_modules('lazymodule', lazy=True)
+        assert len(m) == 1
+        assert not getattr(testapp, 'lazy_loaded', False)
+
+        assert m[0].VALUE == 1
+        assert testapp.lazy_loaded
+        assert import_app_module('etc.tests.testapp', 'lazymodule', lazy=True) is m[0]
+
+    def test_profile(self, command_run):
+        import json
+        from etc.importing import profile_imports
+
+        with profile_imports() as profile:
+            import_project_modules('profiledmodule')
+
+        top = profile.get_top(1)
+        assert len(top) == 1
+
+        record = top[0]
+        assert record.name == 'etc.tests.testapp.profiledmodule'
+        assert record.duration > 0
+        assert record.memory > 0
+        assert [child.name for child in record.children] == [
+            'etc.tests.testapp.profiled', 'etc.tests.testapp.profiled.nested']
+        assert record.as_dict()['children'][0]['name'] == 'etc.tests.testapp.profiled'
+
+        result = command_run('import_profile', args=['toolbox', 'caches'], options={'format': 'json'})
+        assert {item['name'] for item in json.loads(result)} == {'etc.toolbox', 'etc.caches'}
+
+        result = command_run('import_profile', args=['toolbox'], options={'no_memory': True})
+        assert 'etc.toolbox' in result
+
+    def test_index(self):
+        from etc.importing import SUBMODULES_INDEX, IMPORT_TIMINGS, has_app_module
+
+        import_project_modules('caches')
+        assert SUBMODULES_INDEX[('etc', 'caches')] is True
+        assert SUBMODULES_INDEX[('django.contrib.auth', 'caches')] is False
+        assert 'etc.caches' in IMPORT_TIMINGS
+
+        assert has_app_module('etc', 'templatetags.gravatar')
+        assert not has_app_module('etc', 'sites.unknown')
+        assert not has_app_module('etc', 'unknown.sub')
+
 
 def test_include_formatted(request_client):
     result = request_client().get('/index/')
     assert result.content == b'\n<body>thisone\nstatic\n<sub>dynamic</sub>\ndefault\n</body>'
+
+
+def test_include_templates_cache(request_client):
+    from etc.templatetags.etc_misc import TEMPLATES_CACHE, reset_templates_cache
+
+    reset_templates_cache()
+    assert not len(TEMPLATES_CACHE)
+
+    client = request_client()
+    client.get('/index/')
+    cached = len(TEMPLATES_CACHE)
+    assert cached
+
+    result = client.get('/index/')
+    assert len(TEMPLATES_CACHE) == cached
+    assert b'<sub>dynamic</sub>' in result.content
+
+    reset_templates_cache()
+    assert not len(TEMPLATES_CACHE)
+
+
+def test_include_engine_caching(tmp_path):
+    from django.template import Context, Engine
+    from etc.templatetags.etc_misc import TEMPLATES_CACHE, reset_templates_cache
+
+    reset_templates_cache()
+
+    engine = Engine(
+        dirs=[str(tmp_path)],
+        loaders=['django.template.loaders.filesystem.Loader'],
+        libraries={'etc_misc': 'etc.templatetags.etc_misc'},
+    )
+    template = engine.from_string('{% load etc_misc %}{% include_ "part_{{ name }}.html" %}')
+
+    partial = tmp_path / 'part_a.html'
+
+    partial.write_text('v1')
+    assert template.render(Context({'name': 'a'})) == 'v1'
+
+    # Engine with no cached loader re-reads templates.
+    partial.write_text('v2')
+    assert template.render(Context({'name': 'a'})) == 'v2'
+    assert not len(TEMPLATES_CACHE)
+
+
+def test_include_missing_debug(tmp_path):
+    from django.template import Context, Engine
+    from etc.templatetags.etc_misc import MISSING_CACHE, reset_templates_cache
+
+    reset_templates_cache()
+
+    engine = Engine(
+        debug=True,
+        dirs=[str(tmp_path)],
+        loaders=['django.template.loaders.filesystem.Loader'],
+        libraries={'etc_misc': 'etc.templatetags.etc_misc'},
+    )
+    template = engine.from_string('{% load etc_misc %}{% include_ "part_{{ name }}.html" fallback "default.html" %}')
+
+    (tmp_path / 'default.html').write_text('default')
+    assert template.render(Context({'name': 'a'})) == 'default'
+
+    # Template created after a fallback render is picked up.
+    (tmp_path / 'part_a.html').write_text('created')
+    assert template.render(Context({'name': 'a'})) == 'created'
+    assert not len(MISSING_CACHE)
+
+
+def test_include_no_copies(monkeypatch):
+    from django.template.base import FilterExpression
+    from django.template.loader import render_to_string
+
+    def fail(*args, **kwargs):  # pragma: nocover
+        raise AssertionError('FilterExpression is copied on render')
+
+    monkeypatch.setattr(FilterExpression, '__copy__', fail, raising=False)
+    monkeypatch.setattr(FilterExpression, '__deepcopy__', fail, raising=False)
+
+    items = ['dynamic', 'bogus'] * 500
+
+    result = render_to_string('loop.html', {'items': items})
+    assert result == '<sub>dynamic</sub>default' * 500
+
+
+def test_include_missing_cache(monkeypatch):
+    from django.template import Engine
+    from django.template.loader import render_to_string
+    from etc.templatetags.etc_misc import MISSING_CACHE, reset_templates_cache
+
+    reset_templates_cache()
+
+    requested = []
+    get_template = Engine.get_template
+
+    def get_template_(self, template_name):
+        requested.append(template_name)
+        return get_template(self, template_name)
+
+    monkeypatch.setattr(Engine, 'get_template', get_template_)
+
+    assert render_to_string('loop.html', {'items': ['bogus']}) == 'default'
+    assert requested.count('sub_bogus.html') == 1
+    assert len(MISSING_CACHE) == 1
+
+    assert render_to_string('loop.html', {'items': ['bogus', 'bogus']}) == 'defaultdefault'
+    assert requested.count('sub_bogus.html') == 1
+
+    reset_templates_cache()
+    assert not len(MISSING_CACHE)
+
+
+def test_include_batch(template_render_tag):
+    from django.template.loader import render_to_string
+
+    result = render_to_string('batch.html', {'items': ['dynamic', 'bogus', 'dynamic']})
+    assert result == '<sub>dynamic</sub>default<sub>dynamic</sub>|<sub>dynamic</sub>default<sub>dynamic</sub>|'
+
+    with pytest.raises(TemplateDoesNotExist):
+        template_render_tag(
+            'etc_misc', 'include_ "sub_{{ item }}.html" for item in items',
+            context={'items': ['bogus']})
+
+    with pytest.raises(TemplateSyntaxError):
+        template_render_tag('etc_misc', 'include_ "sub_{{ item }}.html" for item from items')
+
+    with pytest.raises(TemplateSyntaxError):
+        template_render_tag('etc_misc', 'include_ name_var for item in items')
+
+    # Values of the previous item do not leak into expressions.
+    context = {'items': ['counter'] * 3, 'n': 0}
+
+    result = template_render_tag(
+        'etc_misc', 'include_ "sub_{{ item }}.html" for item in items with n=n|add:1', context=context)
+    assert result == '[1][1][1]'
+
+    result = template_render_tag(
+        'etc_misc', 'for item in items %}{% include_ "sub_{{ item }}.html" with n=n|add:1 %}{% endfor',
+        context=context)
+    assert result == '[1][1][1]'
+
+
+def test_include_stream():
+    from django.template.loader import get_template, render_to_string
+    from etc.templatetags.etc_misc import stream_template
+
+    context = {'items': ['dynamic', 'bogus'] * 3, 'postfix_var': 'dynamic'}
+
+    expected = render_to_string('stream.html', context)
+    assert expected == '<a>' + '<sub>dynamic</sub>default' * 3 + '</a><sub>dynamic</sub>default'
+
+    chunks = list(stream_template('stream.html', context))
+    assert len(chunks) > 6
+    assert ''.join(chunks) == expected
+
+    assert ''.join(stream_template(get_template('stream.html'), context)) == expected
+
+
+def test_templatetags_import_cost():
+    # Every template tags library is imported in a fresh process
+    # with settings configured, but apps registry not populated.
+    # Import cost is checked by contrib models modules loaded on import (there should be none).
+    import etc.templatetags
+    import subprocess
+    import sys
+    from pkgutil import iter_modules
+
+    script = (
+        'import sys;'
+        'import django.template;'
+        'from django.conf import settings; settings.configure();'
+        'import etc.templatetags.%s;'
+        'print(",".join(name for name in sys.modules if name.startswith("django.contrib") and name.endswith(".models")))'
+    )
+
+    loaded = {}
+
+    for module in iter_modules(etc.templatetags.__path__):
+        name = module.name
+        result = subprocess.run(
+            [sys.executable, '-c', script % name],
+            capture_output=True, text=True, env={**environ, 'PYTHONPATH': ':'.join(sys.path)})
+
+        assert result.returncode == 0, result.stderr
+        loaded[name] = result.stdout.strip()
+
+    assert loaded == {'etc_misc': '', 'gravatar': '', 'model_field': '', 'model_meta': ''}
@@ -0,0 +1,5 @@
+from etc.tests import testapp
+
+testapp.lazy_loaded = True
+
+VALUE = 1
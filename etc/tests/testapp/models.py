@@ -1,6 +1,8 @@
 from sys import version_info
 from django.db import models
 
+from etc.mixins import GravatarHashMixin
+from etc.models import GravatarHashField
 from etc.toolbox import InheritedModel
 
 
@@ -55,3 +57,32 @@ class MyChildModel2(InheritedModel, MyParentModel):
 
     class Fields:
         code = 'Non-secret code'
+
+
+class MyGravatarUser(GravatarHashMixin, models.Model):
+
+    username = models.CharField(max_length=50)
+    email = models.CharField(max_length=50, blank=True)
+
+
+class MyPropertyGravatarUser(models.Model):
+
+    nick = models.CharField(max_length=50)
+    gravatar_hash = GravatarHashField(source=('contact', 'nick'))
+
+    @property
+    def contact(self):
+        return f'{self.nick}@sign.som'
+
+
+class MyEmailUser(models.Model):
+
+    USERNAME_FIELD = 'contact'
+
+    contact = models.CharField(max_length=50)
+
+
+MyWideModel = type('MyWideModel', (models.Model,), {
+    '__module__': __name__,
+    **{f'field_{idx}': models.CharField(f'Field {idx}', max_length=10) for idx in range(300)}
+})
@@ -0,0 +1 @@
+import json
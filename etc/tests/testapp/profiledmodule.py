@@ -0,0 +1,4 @@
+from . import profiled
+from .profiled import nested
+
+VALUE = [0] * 10000
@@ -1,5 +1,7 @@
-from .choices import choices_list, get_choices, ChoicesEnumMixin
-from .importing import import_app_module, import_project_modules
-from .forms import set_form_widgets_attrs
-from .models import get_model_class_from_settings, get_model_class_from_string, InheritedModel
-from .sites import get_site_url
+from .choices import choices_list, get_choices, get_choices_translated, choices_display, ChoicesEnumMixin
+from .importing import import_app_module, import_project_modules, has_app_module
+from .forms import set_form_widgets_attrs, WidgetsAttrs
+from .meta import get_model_meta
+from .models import get_model_class_from_settings, get_model_class_from_string, InheritedModel, \
+    GravatarHashField
+from .sites import get_site_url, aget_site_url, get_absolute_url, iter_absolute_urls